@@ -0,0 +1,57 @@
+"""log_payload
+
+Revision ID: a7e4c9d2f5b8
+Revises: f5b1d8e3c2a4
+Create Date: 2026-10-17 15:47:05.118273
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7e4c9d2f5b8'
+down_revision: Union[str, None] = 'f5b1d8e3c2a4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+UUID_PATTERN = "[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"
+
+# Переносим в payload то, что однозначно разбирается из старого текстового info
+BACKFILL = [
+    (
+        "type IN ('member invite', 'member remove') AND info ~ '^{uuid}$'",
+        "jsonb_build_object('member_id', info)",
+    ),
+    (
+        "type = 'member change role' AND info ~ '^{uuid} to \\w+$'",
+        "jsonb_build_object('member_id', split_part(info, ' ', 1), 'role', split_part(info, ' to ', 2))",
+    ),
+    (
+        "type IN ('column create', 'column removed', 'column updated') AND info ~ '^{uuid}'",
+        "jsonb_build_object('column_id', split_part(info, ' ', 1))",
+    ),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('project_logs', sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+    for condition, payload in BACKFILL:
+        op.execute(f"UPDATE project_logs SET payload = {payload} WHERE {condition.format(uuid=UUID_PATTERN)}")
+    # Для секционированной таблицы CREATE INDEX CONCURRENTLY не поддерживается
+    op.create_index(
+        'ix_project_logs_payload', 'project_logs', ['payload'],
+        postgresql_using='gin',
+        postgresql_ops={'payload': 'jsonb_path_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_project_logs_payload', table_name='project_logs')
+    op.drop_column('project_logs', 'payload')
@@ -0,0 +1,58 @@
+"""hot_path_indexes
+
+Revision ID: b3f1c9a4d2e7
+Revises: 7e8ba50df66a
+Create Date: 2026-10-17 11:03:27.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f1c9a4d2e7'
+down_revision: Union[str, None] = '7e8ba50df66a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (имя индекса, таблица, колонки, уникальный)
+INDEXES = [
+    ('ix_tasks_column_id', 'tasks', ['column_id'], False),
+    ('ix_tasks_assignee_id', 'tasks', ['assignee_id'], False),
+    ('ix_tasks_producer_id', 'tasks', ['producer_id'], False),
+    ('ix_columns_project_id_position', 'columns', ['project_id', 'position'], False),
+    ('uq_project_users_project_id_user_id', 'project_users', ['project_id', 'user_id'], True),
+    ('ix_project_users_user_id', 'project_users', ['user_id'], False),
+    ('ix_project_logs_project_id_created_at', 'project_logs', ['project_id', 'created_at'], False),
+    ('ix_project_logs_task_id_created_at', 'project_logs', ['task_id', 'created_at'], False),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Дубликаты участников не дадут построить уникальный индекс: оставляем самую раннюю запись
+    op.execute(
+        "DELETE FROM project_users a USING project_users b "
+        "WHERE a.project_id = b.project_id AND a.user_id = b.user_id "
+        "AND (a.created_at, a.id) > (b.created_at, b.id)"
+    )
+
+    # CREATE INDEX CONCURRENTLY не блокирует запись, но не может выполняться внутри транзакции
+    with op.get_context().autocommit_block():
+        for name, table, columns, unique in INDEXES:
+            op.create_index(
+                name, table, columns,
+                unique=unique,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
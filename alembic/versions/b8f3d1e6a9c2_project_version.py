@@ -0,0 +1,28 @@
+"""project_version
+
+Revision ID: b8f3d1e6a9c2
+Revises: a7e4c9d2f5b8
+Create Date: 2026-10-17 16:32:41.502817
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8f3d1e6a9c2'
+down_revision: Union[str, None] = 'a7e4c9d2f5b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('projects', sa.Column('version', sa.BigInteger(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('projects', 'version')
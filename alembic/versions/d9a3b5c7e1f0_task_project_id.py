@@ -0,0 +1,48 @@
+"""task_project_id
+
+Revision ID: d9a3b5c7e1f0
+Revises: c4d8e2f6a913
+Create Date: 2026-10-17 13:25:52.730164
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9a3b5c7e1f0'
+down_revision: Union[str, None] = 'c4d8e2f6a913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('tasks', sa.Column('project_id', sa.Uuid(), nullable=True))
+    op.execute(
+        "UPDATE tasks SET project_id = columns.project_id "
+        "FROM columns WHERE columns.id = tasks.column_id"
+    )
+    op.alter_column('tasks', 'project_id', nullable=False)
+    op.create_foreign_key(
+        'tasks_project_id_fkey', 'tasks', 'projects', ['project_id'], ['id'], ondelete='CASCADE'
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tasks_project_id_column_id', 'tasks', ['project_id', 'column_id'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_tasks_project_id_column_id', table_name='tasks', postgresql_concurrently=True, if_exists=True
+        )
+    op.drop_constraint('tasks_project_id_fkey', 'tasks', type_='foreignkey')
+    op.drop_column('tasks', 'project_id')
@@ -0,0 +1,80 @@
+"""ranks
+
+Revision ID: e2c7f4a8b6d1
+Revises: d9a3b5c7e1f0
+Create Date: 2026-10-17 14:08:33.671942
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2c7f4a8b6d1'
+down_revision: Union[str, None] = 'd9a3b5c7e1f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Начальные ранги: шестнадцатеричные цифры входят в алфавит рангов и упорядочены так же.
+# Шаг 0x10000 оставляет место для вставок, хвостовые нули отбрасываются (см. src.rank).
+RANK_BACKFILL = (
+    "UPDATE {table} SET rank = ranked.rank FROM ("
+    "SELECT id, rtrim(lpad(to_hex(row_number() OVER (PARTITION BY {scope} ORDER BY {order}) * 65536), 12, '0'), '0') "
+    "AS rank FROM {table}"
+    ") AS ranked WHERE ranked.id = {table}.id"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, scope, order in (
+        ('columns', 'project_id', 'position, created_at, id'),
+        ('tasks', 'column_id', 'created_at, id'),
+    ):
+        op.add_column(table, sa.Column('rank', sa.String(collation='C'), nullable=True))
+        op.execute(RANK_BACKFILL.format(table=table, scope=scope, order=order))
+        op.alter_column(table, 'rank', nullable=False)
+
+    op.drop_index('ix_columns_project_id_position', table_name='columns', if_exists=True)
+    op.drop_column('columns', 'position')
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_columns_project_id_rank', 'columns', ['project_id', 'rank'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_tasks_column_id_rank', 'tasks', ['column_id', 'rank'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        # Поиск по column_id обслуживает ix_tasks_column_id_rank, отдельный индекс только замедляет запись
+        op.drop_index('ix_tasks_column_id', table_name='tasks', postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tasks_column_id', 'tasks', ['column_id'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index('ix_tasks_column_id_rank', table_name='tasks', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_columns_project_id_rank', table_name='columns', postgresql_concurrently=True, if_exists=True)
+
+    op.add_column('columns', sa.Column('position', sa.Integer(), nullable=True))
+    op.execute(
+        "UPDATE columns SET position = ranked.position FROM ("
+        "SELECT id, row_number() OVER (PARTITION BY project_id ORDER BY rank, id) - 1 AS position FROM columns"
+        ") AS ranked WHERE ranked.id = columns.id"
+    )
+    op.alter_column('columns', 'position', nullable=False)
+    op.create_index('ix_columns_project_id_position', 'columns', ['project_id', 'position'])
+
+    op.drop_column('tasks', 'rank')
+    op.drop_column('columns', 'rank')
@@ -0,0 +1,112 @@
+"""partition_project_logs
+
+Revision ID: f5b1d8e3c2a4
+Revises: e2c7f4a8b6d1
+Create Date: 2026-10-17 15:02:18.446391
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5b1d8e3c2a4'
+down_revision: Union[str, None] = 'e2c7f4a8b6d1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+COLUMNS = "id, created_at, project_id, task_id, user_id, type, info, updated_at"
+INDEXES = [
+    ('ix_project_logs_project_id_created_at', ['project_id', 'created_at']),
+    ('ix_project_logs_task_id_created_at', ['task_id', 'created_at']),
+]
+
+# Месячные секции от самого старого лога до трёх месяцев вперёд,
+# дальше их создаёт src.service.log_maintenance
+CREATE_PARTITIONS = """
+DO $$
+DECLARE
+    month date := date_trunc('month', coalesce(
+        (SELECT min(created_at) FROM project_logs_legacy), now() AT TIME ZONE 'utc'
+    ));
+BEGIN
+    WHILE month <= date_trunc('month', now() AT TIME ZONE 'utc') + interval '3 months' LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF project_logs FOR VALUES FROM (%L) TO (%L)',
+            'project_logs_' || to_char(month, 'YYYYMM'), month, month + interval '1 month'
+        );
+        month := month + interval '1 month';
+    END LOOP;
+END $$
+"""
+
+
+def _log_columns() -> list:
+    return [
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('project_id', sa.Uuid(), nullable=True),
+        sa.Column('task_id', sa.Uuid(), nullable=True),
+        sa.Column('user_id', sa.Uuid(), nullable=True),
+        sa.Column('type', sa.String(), nullable=False),
+        sa.Column('info', sa.Text(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='SET NULL'),
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('projects', sa.Column('log_retention_days', sa.Integer(), nullable=True))
+
+    # Таблицу нельзя секционировать на месте: переливаем данные в новую
+    op.rename_table('project_logs', 'project_logs_legacy')
+    op.execute("ALTER INDEX IF EXISTS project_logs_pkey RENAME TO project_logs_legacy_pkey")
+    for name, _ in INDEXES:
+        op.drop_index(name, table_name='project_logs_legacy', if_exists=True)
+
+    op.create_table(
+        'project_logs',
+        *_log_columns(),
+        sa.PrimaryKeyConstraint('id', 'created_at'),
+        postgresql_partition_by='RANGE (created_at)',
+    )
+    for name, columns in INDEXES:
+        op.create_index(name, 'project_logs', columns)
+    op.execute(CREATE_PARTITIONS)
+    op.execute(f"INSERT INTO project_logs ({COLUMNS}) SELECT {COLUMNS} FROM project_logs_legacy")
+    op.drop_table('project_logs_legacy')
+
+    op.create_table(
+        'project_log_daily',
+        sa.Column('project_id', sa.Uuid(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('type', sa.String(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('project_id', 'day', 'type'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('project_log_daily')
+
+    op.rename_table('project_logs', 'project_logs_partitioned')
+    op.execute("ALTER INDEX IF EXISTS project_logs_pkey RENAME TO project_logs_partitioned_pkey")
+    for name, _ in INDEXES:
+        op.drop_index(name, table_name='project_logs_partitioned', if_exists=True)
+
+    op.create_table('project_logs', *_log_columns(), sa.PrimaryKeyConstraint('id'))
+    for name, columns in INDEXES:
+        op.create_index(name, 'project_logs', columns)
+    op.execute(f"INSERT INTO project_logs ({COLUMNS}) SELECT {COLUMNS} FROM project_logs_partitioned")
+    # Секции удаляются вместе с родительской таблицей
+    op.drop_table('project_logs_partitioned')
+
+    op.drop_column('projects', 'log_retention_days')
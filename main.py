@@ -1,9 +1,38 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
+
+from src.config import settings
 from src.routers import router
+from src.service.events import bus
+from src.service.log_maintenance import prepare_partitions, run_periodically
+from src.service.log_writer import log_writer
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await bus.start()
+    # Секции логов должны существовать, даже если периодическое обслуживание отключено
+    await prepare_partitions()
+    if settings.LOG_WRITER_ENABLED:
+        log_writer.start()
+    maintenance = None
+    if settings.LOG_MAINTENANCE_INTERVAL_SECONDS > 0:
+        maintenance = asyncio.create_task(run_periodically(settings.LOG_MAINTENANCE_INTERVAL_SECONDS))
+    yield
+    if maintenance:
+        maintenance.cancel()
+        with suppress(asyncio.CancelledError):
+            await maintenance
+    # Дописываем накопленные логи до остановки процесса
+    await log_writer.stop()
+    await bus.stop()
 
 
 app = FastAPI(
     title="KanBanBoard",
+    lifespan=lifespan,
 )
 
 app.include_router(router)
@@ -0,0 +1,126 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+from uuid import UUID
+
+from src.config import settings
+
+
+class TTLCache:
+    """
+    Простой in-process кэш с LRU-вытеснением и временем жизни записей.
+
+    Не потокобезопасен, но в рамках одного event loop этого достаточно:
+    все операции синхронные и не содержат точек переключения.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        """
+        :param maxsize: Максимальное количество записей.
+        :param ttl: Время жизни записи по умолчанию в секундах.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Получить значение по ключу.
+
+        :param key: Ключ записи.
+        :param default: Значение, возвращаемое при промахе.
+        :return: Сохранённое значение или `default`, если запись отсутствует или устарела.
+        """
+        item = self._data.get(key)
+        if item is None:
+            return default
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Сохранить значение.
+
+        :param key: Ключ записи.
+        :param value: Значение.
+        :param ttl: Время жизни в секундах; не может превышать TTL кэша.
+        """
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        """Удалить запись по ключу, если она есть."""
+        self._data.pop(key, None)
+
+    def discard_where(self, predicate: Callable[[Hashable, Any], bool]) -> None:
+        """
+        Удалить все записи, для которых `predicate(key, value)` истинно.
+
+        Проходит по всему кэшу, поэтому предназначен для редких инвалидаций.
+        """
+        for key in [k for k, (_, v) in self._data.items() if predicate(k, v)]:
+            del self._data[key]
+
+    def clear(self) -> None:
+        """Очистить кэш."""
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# Кэш аутентифицированных пользователей: (username, exp токена) -> Principal (снимок без связи с сессией)
+principal_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+def invalidate_user(username: str) -> None:
+    """
+    Сбросить закэшированные данные пользователя.
+
+    Вызывается при любом изменении пользователя (профиль, пароль, удаление).
+    """
+    principal_cache.discard_where(lambda key, _: key[0] == username)
+
+
+# Кэш ролей участников проектов: (project_id, user_id) -> ProjectUserRole | None
+membership_cache = TTLCache(
+    maxsize=settings.MEMBERSHIP_CACHE_SIZE,
+    ttl=settings.MEMBERSHIP_CACHE_TTL_SECONDS,
+)
+
+
+def invalidate_membership(project_id: UUID, user_id: Optional[UUID] = None) -> None:
+    """
+    Сбросить закэшированные роли в проекте.
+
+    Если `user_id` не указан, сбрасываются роли всех участников проекта.
+    """
+    if user_id is not None:
+        membership_cache.pop((project_id, user_id))
+    else:
+        membership_cache.discard_where(lambda key, _: key[0] == project_id)
+
+
+# Кэш нефильтрованных досок: (project_id, версия проекта) -> ProjectTaskResponse.
+# Версия в ключе делает устаревшие снимки недостижимыми, инвалидация лишь освобождает память.
+board_cache = TTLCache(
+    maxsize=settings.BOARD_CACHE_SIZE,
+    ttl=settings.BOARD_CACHE_TTL_SECONDS,
+)
+
+
+def invalidate_board(project_id: UUID) -> None:
+    """Сбросить закэшированные снимки доски проекта."""
+    board_cache.discard_where(lambda key, _: key[0] == project_id)
@@ -3,6 +3,14 @@ from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    # Одна транзакция на запрос вместо коммита в каждом вызове DAO
+    DB_UNIT_OF_WORK: bool = True
+    # Предупреждать в лог о фильтрах DAO, не покрытых индексами
+    DAO_INDEX_CHECK: bool = True
+    # Сколько дополнительных соединений run_concurrently занимает одновременно во всём процессе.
+    # Должно быть меньше pool_size + max_overflow движка (по умолчанию 5 + 10): каждый запрос
+    # уже держит своё соединение, и остальным запросам пул должен оставаться доступен
+    DB_READ_CONCURRENCY: int = 4
 
     ACCESS_SECRET_KEY: str
     REFRESH_SECRET_KEY: str
@@ -10,6 +18,48 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int
     REFRESH_TOKEN_EXPIRE_DAYS: int
 
+    # Класть в access токен id и профиль пользователя, чтобы аутентификация не ходила в БД
+    ACCESS_TOKEN_CLAIMS: bool = False
+    TOKEN_REVOCATION_REFRESH_SECONDS: int = 15
+
+    PRINCIPAL_CACHE_SIZE: int = 10_000
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    MEMBERSHIP_CACHE_SIZE: int = 50_000
+    MEMBERSHIP_CACHE_TTL_SECONDS: int = 30
+    # Снимки досок проектов по (project_id, версия проекта)
+    BOARD_CACHE_SIZE: int = 1_000
+    BOARD_CACHE_TTL_SECONDS: int = 300
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 32
+
+    # Длина ранга, после которой задачи колонки (или колонки проекта) ранжируются заново
+    RANK_REBALANCE_LENGTH: int = 16
+
+    # Фоновая пакетная запись логов проектов; False — писать синхронно в транзакции запроса
+    LOG_WRITER_ENABLED: bool = True
+    LOG_WRITER_BATCH_SIZE: int = 500
+    LOG_WRITER_FLUSH_SECONDS: float = 0.5
+    LOG_WRITER_MAX_QUEUE: int = 10_000
+    LOG_WRITER_PUT_TIMEOUT_SECONDS: float = 1.0
+
+    # Обслуживание секций project_logs (см. src.service.log_maintenance)
+    LOG_RETENTION_DAYS: int = 365
+    LOG_PARTITIONS_AHEAD: int = 3
+    # Отсоединять истёкшие секции вместо удаления, чтобы их можно было выгрузить в архив
+    LOG_ARCHIVE_EXPIRED_PARTITIONS: bool = False
+    # Период фонового обслуживания в секундах; 0 — только вручную (python -m src.service.log_maintenance).
+    # Без обслуживания через LOG_PARTITIONS_AHEAD месяцев не останется секций и запись логов перестанет работать
+    LOG_MAINTENANCE_INTERVAL_SECONDS: int = 3600
+
+    # Realtime-обновления доски (SSE и WebSocket)
+    # Сколько непрочитанных событий держать на подписчика, прежде чем попросить его перезагрузить доску
+    REALTIME_QUEUE_SIZE: int = 100
+    REALTIME_HEARTBEAT_SECONDS: int = 15
+
+    # Шина событий между воркерами: memory — один процесс, postgres — LISTEN/NOTIFY
+    EVENT_BUS_BACKEND: str = "memory"
+    EVENT_BUS_CHANNEL: str = "kanban_events"
+
     class Config:
         env_file = ".env"
         extra = "allow"
@@ -1,5 +1,6 @@
 from src.dao.user import UserDAO
 from src.dao.project import ProjectDAO, ProjectUserDAO
-from src.dao.logs import ProjectLogDAO
+from src.dao.logs import ProjectLogDAO, ProjectLogDailyDAO
 from src.dao.task import TaskDAO
 from src.dao.column import ColumnDAO
+from src.dao.token import TokenRevocationDAO
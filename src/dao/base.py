@@ -1,13 +1,18 @@
 import uuid
 from uuid import UUID
 from abc import ABC
-from typing import Union
+from typing import Iterable, Optional, Sequence, Union
 
 from fastapi import Depends
-from sqlalchemy import select, insert, delete, update
+from sqlalchemy import select, insert, delete, update, values, column, func, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
 
+from src.config import settings
+from src.dao.pagination import paginate
+from src.index_check import warn_if_unindexed
 from src.db import get_async_db
+from src.rank import rank_after, rank_between, spread_ranks
 
 
 class BaseDAO(ABC):
@@ -19,6 +24,9 @@ class BaseDAO(ABC):
     """
 
     model = None
+    # Для моделей с колонкой `rank`: (модель-владелец группы, поле группы), например (Project, "project_id").
+    # Строка владельца блокируется на время вычисления рангов и ребалансировки группы.
+    rank_scope = None
 
     def __init__(self, session: AsyncSession = Depends(get_async_db)):
         """
@@ -28,6 +36,24 @@ class BaseDAO(ABC):
         """
         self.session = session
 
+    async def commit(self):
+        """
+        Зафиксировать изменения.
+
+        Если сессия работает в режиме unit of work (см. `get_async_db`), изменения только
+        сбрасываются в БД, а коммит выполнится один раз в конце запроса.
+        """
+        if self.session.info.get("unit_of_work"):
+            self.session.info["has_writes"] = True
+            await self.session.flush()
+        else:
+            await self.session.commit()
+
+    def _check_filter(self, filter_by: dict):
+        """Предупредить в лог, если фильтр не покрыт индексом (см. `src.index_check`)."""
+        if settings.DAO_INDEX_CHECK:
+            warn_if_unindexed(self.model.__table__, frozenset(k for k in filter_by if k != "id"))
+
     async def find_by_id(self, model_id: Union[int, UUID]):
         """
         Найти запись по первичному ключу `id`.
@@ -46,6 +72,7 @@ class BaseDAO(ABC):
         :param filter_by: Параметры фильтрации как именованные аргументы.
         :return: Экземпляр модели или None.
         """
+        self._check_filter(filter_by)
         query = select(self.model).filter_by(**filter_by)
         result = await self.session.execute(query)
         return result.scalar_one_or_none()
@@ -57,10 +84,34 @@ class BaseDAO(ABC):
         :param filter_by: Параметры фильтрации как именованные аргументы.
         :return: Список экземпляров модели.
         """
+        self._check_filter(filter_by)
         query = select(self.model).filter_by(**filter_by)
         result = await self.session.execute(query)
         return result.scalars().all()
 
+    async def find_page(
+            self,
+            limit: int,
+            cursor: Optional[str] = None,
+            order_by: Optional[Sequence[InstrumentedAttribute]] = None,
+            descending: bool = False,
+            **filter_by
+    ) -> tuple[list, Optional[str]]:
+        """
+        Найти страницу записей, соответствующих фильтрам (keyset-пагинация).
+
+        :param limit: Размер страницы.
+        :param cursor: Непрозрачный курсор из предыдущей страницы.
+        :param order_by: Колонки сортировки, по умолчанию `(created_at, id)`.
+        :param descending: Сортировать по убыванию.
+        :param filter_by: Параметры фильтрации как именованные аргументы.
+        :return: Список экземпляров модели и курсор следующей страницы (или None).
+        """
+        self._check_filter(filter_by)
+        keys = order_by or (self.model.created_at, self.model.id)
+        query = select(self.model).filter_by(**filter_by)
+        return await paginate(self.session, query, keys, limit, cursor, descending)
+
     async def add(self, **data):
         """
         Добавить новую запись в таблицу.
@@ -68,42 +119,64 @@ class BaseDAO(ABC):
         :param data: Данные новой записи как именованные аргументы.
         :return: Добавленный экземпляр модели.
         """
-        query = insert(self.model).values(id=uuid.uuid4(), **data).returning(self.model)
-        result = await self.session.execute(query)
-        await self.session.commit()
-        return result.scalar_one_or_none()
+        instances = await self.add_many([data])
+        return instances[0] if instances else None
+
+    async def add_many(self, rows: list[dict]) -> list:
+        """
+        Добавить несколько записей одним многострочным INSERT.
+
+        :param rows: Список словарей с данными новых записей.
+        :return: Список добавленных экземпляров модели в порядке `rows`.
+        """
+        if not rows:
+            return []
+        query = insert(self.model).returning(self.model, sort_by_parameter_order=True)
+        result = await self.session.scalars(query, [{"id": uuid.uuid4(), **row} for row in rows])
+        instances = result.all()
+        await self.commit()
+        return instances
 
     async def delete(self, model_id: Union[int, UUID]):
         """
         Удалить запись по ID, если она существует.
 
+        Проверка существования и удаление выполняются одним запросом `DELETE ... RETURNING`.
+
         :param model_id: ID записи.
         :return: Словарь с сообщением об успешном удалении или None, если запись не найдена.
         """
-        query = select(self.model).filter_by(id=model_id)
-        result = await self.session.execute(query)
-        if not result.scalar_one_or_none():
+        if not await self.delete_many([model_id]):
             return None
-
-        stmt = delete(self.model).filter(self.model.id == model_id)
-        await self.session.execute(stmt)
-        await self.session.commit()
         return {"message": "Record deleted successfully"}
 
+    async def delete_many(self, model_ids: Iterable[Union[int, UUID]]) -> list:
+        """
+        Удалить несколько записей по ID одним запросом.
+
+        :param model_ids: ID удаляемых записей.
+        :return: Список ID фактически удалённых записей.
+        """
+        model_ids = list(model_ids)
+        if not model_ids:
+            return []
+        stmt = delete(self.model).where(self.model.id.in_(model_ids)).returning(self.model.id)
+        result = await self.session.execute(stmt)
+        deleted = result.scalars().all()
+        if deleted:
+            await self.commit()
+        return deleted
+
     async def update(self, model_id: Union[int, UUID], **update_data):
         """
         Обновить существующую запись по ID.
 
+        Проверка существования и обновление выполняются одним запросом `UPDATE ... RETURNING`.
+
         :param model_id: ID записи.
         :param update_data: Данные для обновления как именованные аргументы.
         :return: Обновлённый экземпляр модели или None, если запись не найдена.
         """
-        query = select(self.model).filter_by(id=model_id)
-        result = await self.session.execute(query)
-        instance = result.scalar_one_or_none()
-        if not instance:
-            return None
-
         stmt = (
             update(self.model)
             .where(self.model.id == model_id)
@@ -111,5 +184,130 @@ class BaseDAO(ABC):
             .returning(self.model)
         )
         result = await self.session.execute(stmt)
-        await self.session.commit()
-        return result.scalar_one_or_none()
+        instance = result.scalar_one_or_none()
+        if not instance:
+            return None
+
+        await self.commit()
+        return instance
+
+    async def update_many(self, rows: list[dict]) -> list:
+        """
+        Обновить несколько записей, у каждой — свои значения.
+
+        Строки с одинаковым набором полей обновляются одним запросом
+        `UPDATE ... FROM (VALUES ...) RETURNING`.
+
+        :param rows: Список словарей; в каждом обязателен ключ `id`, остальные ключи — обновляемые поля.
+        :return: Список обновлённых экземпляров модели (несуществующие ID пропускаются).
+        """
+        groups: dict[tuple, list[dict]] = {}
+        for row in rows:
+            keys = ("id", *sorted(k for k in row if k != "id"))
+            groups.setdefault(keys, []).append(row)
+
+        table = self.model.__table__
+        instances = []
+        for keys, group in groups.items():
+            data = values(
+                *[column(key, table.c[key].type) for key in keys], name="data"
+            ).data([tuple(row[key] for key in keys) for row in group])
+            stmt = (
+                update(self.model)
+                .where(self.model.id == data.c.id)
+                .values({key: data.c[key] for key in keys[1:]})
+                .returning(self.model)
+                .execution_options(synchronize_session="fetch")
+            )
+            result = await self.session.scalars(stmt)
+            instances.extend(result.all())
+
+        if instances:
+            await self.commit()
+        return instances
+
+    async def rank_at(self, position: Optional[int] = None, exclude_id: Optional[UUID] = None, **scope) -> str:
+        """
+        Ранг для вставки записи на указанную позицию (для моделей с колонкой `rank`).
+
+        Читаются только ранги соседей, остальные записи не изменяются.
+
+        :param position: Позиция (с нуля) среди записей `scope`; None — в конец.
+        :param exclude_id: ID перемещаемой записи, которая не учитывается при подсчёте позиций.
+        :param scope: Фильтры, задающие упорядочиваемую группу (например, `column_id`).
+        :return: Новый ранг.
+        :raises ValueError: Если у соседей совпадают ранги (нужна ребалансировка).
+        """
+        self._check_filter(scope)
+        await self.lock_rank_scope(**scope)
+        query = select(self.model.rank).filter_by(**scope)
+        if exclude_id is not None:
+            query = query.where(self.model.id != exclude_id)
+        ordered = query.order_by(self.model.rank, self.model.id)
+
+        if position is not None and position <= 0:
+            return rank_between(None, await self.session.scalar(ordered.limit(1)))
+        if position is not None:
+            neighbours = (await self.session.scalars(ordered.offset(position - 1).limit(2))).all()
+            if neighbours:
+                return rank_between(neighbours[0], neighbours[1] if len(neighbours) > 1 else None)
+        # В конец: после записи с наибольшим рангом
+        last = await self.session.scalar(query.with_only_columns(func.max(self.model.rank)))
+        return rank_after(last)
+
+    async def lock_rank_scope(self, **scope) -> None:
+        """
+        Заблокировать строку владельца группы рангов до конца транзакции (см. `rank_scope`).
+
+        Вычисление ранга по соседям и ребалансировка группы берут одну и ту же блокировку,
+        поэтому ранг, посчитанный по старому распределению, не может зафиксироваться
+        после ребалансировки. FOR NO KEY UPDATE не мешает вставке строк, ссылающихся на владельца.
+        Блокируемая строка — строка проекта (см. `ProjectDAO.lock`), чтобы порядок блокировок
+        совпадал с остальными изменениями проекта.
+
+        :param scope: Фильтры группы; должны содержать поле из `rank_scope`.
+        """
+        if self.rank_scope is None:
+            return
+        owner, key = self.rank_scope
+        await self.session.execute(
+            select(owner.id).where(owner.id == scope[key]).with_for_update(key_share=True)
+        )
+
+    async def position_of(self, instance, **scope) -> int:
+        """
+        Позиция записи (с нуля) среди записей `scope` в порядке `(rank, id)`.
+
+        :param instance: Экземпляр модели с колонкой `rank`.
+        :param scope: Фильтры, задающие упорядочиваемую группу.
+        :return: Количество записей перед `instance`.
+        """
+        self._check_filter(scope)
+        query = (
+            select(func.count())
+            .select_from(self.model)
+            .filter_by(**scope)
+            .where(tuple_(self.model.rank, self.model.id) < tuple_(instance.rank, instance.id))
+        )
+        return await self.session.scalar(query)
+
+    async def rebalance(self, **scope) -> int:
+        """
+        Заново распределить ранги записей `scope` равномерно, сохранив их порядок.
+
+        Блокирует владельца группы (см. `lock_rank_scope`) до конца транзакции: параллельные
+        вставки и перемещения ждут ребалансировку и считают ранги уже по новому распределению.
+
+        :param scope: Фильтры, задающие упорядочиваемую группу.
+        :return: Количество обновлённых записей.
+        """
+        self._check_filter(scope)
+        await self.lock_rank_scope(**scope)
+        query = (
+            select(self.model.id)
+            .filter_by(**scope)
+            .order_by(self.model.rank, self.model.id)
+        )
+        ids = (await self.session.scalars(query)).all()
+        rows = [{"id": model_id, "rank": rank} for model_id, rank in zip(ids, spread_ranks(len(ids)))]
+        return len(await self.update_many(rows))
@@ -1,11 +1,15 @@
+from typing import Optional
+from uuid import UUID
+
 from sqlalchemy import select
 
 from src.dao.base import BaseDAO
-from src.models import Column
+from src.models import Column, Project
 
 
 class ColumnDAO(BaseDAO):
     model = Column
+    rank_scope = (Project, "project_id")
 
     async def find_all(self, **filter_by):
         """
@@ -14,6 +18,19 @@ class ColumnDAO(BaseDAO):
         :param filter_by: Параметры фильтрации как именованные аргументы.
         :return: Список экземпляров модели.
         """
-        query = select(self.model).filter_by(**filter_by).order_by("position")
+        query = select(self.model).filter_by(**filter_by).order_by(self.model.rank, self.model.id)
         result = await self.session.execute(query)
         return result.scalars().all()
+
+    async def find_page_by_project(self, project_id: UUID, limit: int, cursor: Optional[str] = None):
+        """
+        Найти страницу колонок проекта в порядке ранга.
+
+        :param project_id: ID проекта.
+        :param limit: Размер страницы.
+        :param cursor: Курсор из предыдущей страницы.
+        :return: Список колонок и курсор следующей страницы (или None).
+        """
+        return await self.find_page(
+            limit, cursor, order_by=(self.model.rank, self.model.id), project_id=project_id
+        )
@@ -1,6 +1,82 @@
+import datetime
+from typing import Optional
+from uuid import UUID
+
+from fastapi import Depends
+from sqlalchemy import Row, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from src.dao.base import BaseDAO
-from src.models import ProjectLog
+from src.dao.pagination import paginate
+from src.dao.projection import columns_for
+from src.db import get_async_db
+from src.models import ProjectLog, ProjectLogDaily
+from src.schemas.log import ProjectLogResponse
 
 
 class ProjectLogDAO(BaseDAO):
     model = ProjectLog
+
+    async def find_page_filtered(
+            self,
+            limit: int,
+            cursor: Optional[str] = None,
+            payload: Optional[dict] = None,
+            **filter_by
+    ) -> tuple[list[Row], Optional[str]]:
+        """
+        Найти страницу логов от новых к старым с фильтром по полям payload.
+
+        Возвращает строки с полями `ProjectLogResponse`, а не сущности: страница логов
+        может быть большой, и ORM-объекты для неё не нужны.
+
+        :param limit: Размер страницы.
+        :param cursor: Курсор из предыдущей страницы.
+        :param payload: Пары ключ-значение, которые должен содержать payload (оператор `@>` по GIN-индексу).
+        :param filter_by: Фильтры по колонкам лога (project_id, task_id, user_id, type).
+        :return: Строки логов и курсор следующей страницы (или None).
+        """
+        self._check_filter(filter_by)
+        query = select(*columns_for(self.model, ProjectLogResponse)).filter_by(**filter_by)
+        if payload:
+            query = query.where(self.model.payload.contains(payload))
+        keys = (self.model.created_at, self.model.id)
+        return await paginate(self.session, query, keys, limit, cursor, descending=True, rows=True)
+
+
+class ProjectLogDailyDAO:
+    """
+    Чтение дневных сводок логов.
+
+    Не наследует `BaseDAO`: у `project_log_daily` нет колонки `id`, ключ — (project_id, day, type),
+    поэтому общие методы по id к этой таблице неприменимы. Сводки пишет `log_maintenance`.
+    """
+    model = ProjectLogDaily
+
+    def __init__(self, session: AsyncSession = Depends(get_async_db)):
+        """
+        :param session: Асинхронная сессия SQLAlchemy.
+        """
+        self.session = session
+
+    async def find_by_project(
+            self,
+            project_id: UUID,
+            since: Optional[datetime.date] = None,
+            until: Optional[datetime.date] = None
+    ) -> list[ProjectLogDaily]:
+        """
+        Найти дневные сводки логов проекта за период.
+
+        :param project_id: ID проекта.
+        :param since: Первый день периода (включительно).
+        :param until: Последний день периода (включительно).
+        :return: Сводки, упорядоченные по дню и типу.
+        """
+        query = select(self.model).where(self.model.project_id == project_id)
+        if since:
+            query = query.where(self.model.day >= since)
+        if until:
+            query = query.where(self.model.day <= until)
+        result = await self.session.execute(query.order_by(self.model.day, self.model.type))
+        return result.scalars().all()
@@ -0,0 +1,87 @@
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, Optional, Sequence
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Упаковать значения ключей сортировки последней записи страницы в непрозрачный курсор.
+
+    :param values: Значения ключей сортировки.
+    :return: Строка курсора (base64url от JSON).
+    """
+    raw = json.dumps([v.isoformat() if isinstance(v, (date, datetime)) else str(v) for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: Sequence[InstrumentedAttribute]) -> list:
+    """
+    Распаковать курсор, приводя значения к типам колонок сортировки.
+
+    :param cursor: Строка курсора.
+    :param keys: Колонки сортировки, для которых был создан курсор.
+    :return: Список значений ключей.
+    :raises HTTPException: 400, если курсор повреждён.
+    """
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if len(raw) != len(keys):
+            raise ValueError("cursor length mismatch")
+        values = []
+        for key, value in zip(keys, raw):
+            python_type = key.type.python_type
+            if python_type is datetime:
+                values.append(datetime.fromisoformat(value))
+            elif python_type is date:
+                values.append(date.fromisoformat(value))
+            elif python_type is UUID:
+                values.append(UUID(value))
+            else:
+                values.append(python_type(value))
+        return values
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+async def paginate(
+        session: AsyncSession,
+        query: Select,
+        keys: Sequence[InstrumentedAttribute],
+        limit: int,
+        cursor: Optional[str] = None,
+        descending: bool = False,
+        rows: bool = False
+) -> tuple[list, Optional[str]]:
+    """
+    Keyset-пагинация произвольного запроса по сущностям или проекциям.
+
+    Ключи сортировки должны однозначно упорядочивать записи (последним обычно идёт `id`).
+
+    :param session: Асинхронная сессия SQLAlchemy.
+    :param query: Запрос `select(Model)` (или выборка колонок при `rows`) с уже применёнными фильтрами.
+    :param keys: Колонки сортировки.
+    :param limit: Размер страницы.
+    :param cursor: Курсор, полученный с предыдущей страницы.
+    :param descending: Сортировать по убыванию.
+    :param rows: Вернуть строки выборки колонок вместо сущностей; ключи должны входить в выборку под своими именами.
+    :return: Записи страницы и курсор следующей страницы (None, если страница последняя).
+    """
+    if cursor:
+        row, last = tuple_(*keys), tuple_(*decode_cursor(cursor, keys))
+        query = query.where(row < last if descending else row > last)
+    order = [key.desc() for key in keys] if descending else list(keys)
+    result = await session.execute(query.order_by(None).order_by(*order).limit(limit + 1))
+    items = result.all() if rows else result.scalars().all()
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor([getattr(items[-1], key.key) for key in keys])
+    return items, next_cursor
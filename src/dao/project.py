@@ -1,11 +1,13 @@
 from typing import List, Optional
 from uuid import UUID
 
-from sqlalchemy import select
-from sqlalchemy.orm import joinedload
+from sqlalchemy import select, update, delete
 
 from src.dao.base import BaseDAO
-from src.models import Project, ProjectUser, ProjectUserRole, Column, Task
+from src.dao.pagination import paginate
+from src.dao.projection import columns_for
+from src.models import Project, ProjectUser, ProjectUserRole, User
+from src.responses import construct
 from src.schemas.project import ProjectCreate, ProjectMemberCreate, ProjectMemberResponse
 
 
@@ -15,36 +17,67 @@ class ProjectDAO(BaseDAO):
     async def create_project(self, project: ProjectCreate) -> Project:
         return await self.add(
             name=project.name,
-            description=project.description
+            description=project.description,
+            log_retention_days=project.log_retention_days
         )
 
-    async def get_projects_by_user(self, user_id: UUID) -> list[Project]:
+    async def get_projects_by_user(
+            self,
+            user_id: UUID,
+            limit: int,
+            cursor: Optional[str] = None
+    ) -> tuple[list[Project], Optional[str]]:
         stmt = (
             select(Project)
             .join(ProjectUser, Project.id == ProjectUser.project_id)
             .where(ProjectUser.user_id == user_id)
         )
-        result = await self.session.execute(stmt)
-        return result.scalars().all()
+        return await paginate(self.session, stmt, (Project.created_at, Project.id), limit, cursor)
 
-    async def get_project_columns_with_tasks(self, project_id: UUID) -> list[Column]:
+    async def get_version(self, project_id: UUID) -> Optional[int]:
         """
-        Получает все колонки проекта вместе с их задачами.
-        
-        Args:
-            project_id (UUID): Идентификатор проекта
-            
-        Returns:
-            list[Column]: Список колонок с их задачами
+        Текущая версия проекта.
+
+        :param project_id: Идентификатор проекта.
+        :return: Версия или None, если проект не найден.
+        """
+        result = await self.session.execute(select(Project.version).where(Project.id == project_id))
+        return result.scalar_one_or_none()
+
+    async def lock(self, project_id: UUID) -> None:
+        """
+        Заблокировать строку проекта до конца транзакции (FOR NO KEY UPDATE).
+
+        Изменения задач и колонок берут эту блокировку первой, до строк задач и колонок,
+        а `bump_version` в конце транзакции обновляет уже заблокированную строку. Один порядок
+        блокировок для всех изменений проекта исключает взаимоблокировки между ними.
+        Вставкам строк со ссылкой на проект (FOR KEY SHARE) блокировка не мешает.
+
+        :param project_id: Идентификатор проекта.
+        """
+        await self.session.execute(
+            select(Project.id).where(Project.id == project_id).with_for_update(key_share=True)
+        )
+
+    async def bump_version(self, project_id: UUID) -> Optional[int]:
+        """
+        Увеличить версию проекта.
+
+        Строка проекта остаётся заблокированной до конца транзакции, поэтому версии
+        параллельных изменений одного проекта идут в порядке их коммитов.
+
+        :param project_id: Идентификатор проекта.
+        :return: Новая версия или None, если проект не найден.
         """
         stmt = (
-            select(Column)
-            .where(Column.project_id == project_id)
-            .options(joinedload(Column.tasks))
-            .order_by(Column.position)
+            update(Project)
+            .where(Project.id == project_id)
+            .values(version=Project.version + 1)
+            .returning(Project.version)
         )
-        result = await self.session.execute(stmt)
-        return result.unique().scalars().all()
+        version = (await self.session.execute(stmt)).scalar_one_or_none()
+        await self.commit()
+        return version
 
 
 class ProjectUserDAO(BaseDAO):
@@ -68,6 +101,21 @@ class ProjectUserDAO(BaseDAO):
             user_id=user_id
         )
 
+    async def get_role(self, project_id: UUID, user_id: UUID) -> Optional[ProjectUserRole]:
+        """
+        Получает роль пользователя в проекте.
+
+        Args:
+            project_id (UUID): Идентификатор проекта.
+            user_id (UUID): Идентификатор пользователя.
+
+        Returns:
+            Optional[ProjectUserRole]: Роль участника или None, если пользователь не состоит в проекте.
+        """
+        stmt = select(ProjectUser.role).filter_by(project_id=project_id, user_id=user_id)
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
     async def get_project_members(self, project_id: UUID) -> List[ProjectMemberResponse]:
         """
         Получает список всех участников проекта с их ролями.
@@ -78,35 +126,38 @@ class ProjectUserDAO(BaseDAO):
         Returns:
             List[ProjectMemberResponse]: Список участников проекта с ролями.
         """
+        # Только поля ответа, без загрузки сущностей ProjectUser и User
         stmt = (
-            select(ProjectUser)
-            .options(joinedload(ProjectUser.user))  # загрузка связанных пользователей
+            select(*columns_for(User, ProjectMemberResponse, role=ProjectUser.role))
+            .join(ProjectUser, ProjectUser.user_id == User.id)
             .where(ProjectUser.project_id == project_id)
         )
 
         result = await self.session.execute(stmt)
-        project_users = result.scalars().all()
-
-        # Формируем ответ в формате схемы ProjectMemberResponse
-        return [
-            ProjectMemberResponse.model_validate(
-                {
-                    **vars(pu.user),
-                    "role": pu.role,
-                }
-            )
-            for pu in project_users
-        ]
+        return [construct(ProjectMemberResponse, row) for row in result]
 
     async def update_role(self, project_id: UUID, user_id: UUID, new_role: str) -> ProjectUser:
-        member = await self.find_one_or_none(project_id=project_id, user_id=user_id)
+        stmt = (
+            update(ProjectUser)
+            .filter_by(project_id=project_id, user_id=user_id)
+            .values(role=new_role)
+            .returning(ProjectUser)
+        )
+        result = await self.session.execute(stmt)
+        member = result.scalar_one_or_none()
         if not member:
             raise ValueError("Member not found")
-        return await self.update(member.id, role=new_role)
+        await self.commit()
+        return member
 
     async def remove_project_member(self, project_id: UUID, user_id: UUID) -> bool:
-        member = await self.find_one_or_none(project_id=project_id, user_id=user_id)
-        if not member:
+        stmt = (
+            delete(ProjectUser)
+            .filter_by(project_id=project_id, user_id=user_id)
+            .returning(ProjectUser.id)
+        )
+        result = await self.session.execute(stmt)
+        if not result.scalars().all():
             return False
-        await self.delete(member.id)
+        await self.commit()
         return True
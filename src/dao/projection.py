@@ -0,0 +1,24 @@
+"""
+Проекции для чтения: выборка только нужных колонок вместо ORM-сущностей.
+
+Строки результата (`sqlalchemy.Row`) — компактные кортежи с доступом к полям по имени.
+Они не попадают в identity map сессии и не отслеживают изменения, поэтому подходят
+только для чтения: из них сразу собираются схемы ответа (см. `src.responses.construct`).
+"""
+from pydantic import BaseModel
+from sqlalchemy.orm import InstrumentedAttribute
+
+
+def columns_for(model, schema: type[BaseModel], **sources: InstrumentedAttribute) -> list:
+    """
+    Колонки для выборки полей схемы.
+
+    :param model: ORM-модель, колонки которой совпадают с полями схемы по имени.
+    :param schema: Схема ответа, поля которой нужно выбрать.
+    :param sources: Поля, которые берутся не из `model` (например, из присоединённой таблицы).
+    :return: Список колонок с метками, равными именам полей схемы.
+    """
+    return [
+        sources[name].label(name) if name in sources else getattr(model, name)
+        for name in schema.model_fields
+    ]
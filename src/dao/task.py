@@ -1,29 +1,93 @@
-from sqlalchemy import select, and_
-from typing import Optional
+import re
+
+from sqlalchemy import Row, select, and_, or_, func
+from typing import NamedTuple, Optional
 from datetime import date
 from uuid import UUID
 from src.dao.base import BaseDAO
-from src.models import Task
+from src.dao.projection import columns_for
+from src.models import Task, Column, Project, ProjectUser, ProjectUserRole
+from src.schemas.task import TaskResponse
+from src.rank import rank_after, rank_between
+
+
+class TaskAccess(NamedTuple):
+    """Задача вместе с проектом и ролью пользователя в нём."""
+    task: Task
+    project_id: UUID
+    role: Optional[ProjectUserRole]
+
+
+def prefix_tsquery(text: str) -> Optional[str]:
+    """
+    Строит tsquery с префиксным поиском по каждому слову: "foo ba" -> "foo:* & ba:*".
+
+    Всё, кроме букв и цифр, отбрасывается, поэтому результат безопасно передавать в to_tsquery.
+    """
+    words = re.findall(r"\w+", text.lower())
+    return " & ".join(f"{word}:*" for word in words) or None
+
+
+def escape_like(value: str) -> str:
+    """Экранирует `/`, `%` и `_`, чтобы строка искалась в LIKE/ILIKE с `escape="/"` буквально."""
+    return value.replace("/", "//").replace("%", "/%").replace("_", "/_")
+
+
+def search_condition(q: str):
+    """
+    Условие полнотекстового поиска задач и выражение релевантности.
+
+    Совпадение ищется по tsvector (префиксы слов title и description) или по
+    триграммному сходству с title, что находит и слова с опечатками.
+
+    Returns:
+        tuple: (условие WHERE, выражение релевантности) или (None, None), если в запросе нет слов.
+    """
+    query_text = prefix_tsquery(q)
+    if not query_text:
+        return None, None
+    tsquery = func.to_tsquery("simple", query_text)
+    condition = or_(Task.search_vector.op("@@")(tsquery), Task.title.op("%")(q))
+    score = func.greatest(func.ts_rank(Task.search_vector, tsquery), func.similarity(Task.title, q))
+    return condition, score
 
 
 class TaskDAO(BaseDAO):
     model = Task
 
-    async def find_filtered(
-            self,
-            project_id: UUID,
+    async def find_with_access(self, task_id: UUID, user_id: UUID) -> Optional[TaskAccess]:
+        """
+        Получает задачу, идентификатор её проекта и роль пользователя в проекте одним запросом.
+
+        Args:
+            task_id (UUID): Идентификатор задачи.
+            user_id (UUID): Идентификатор пользователя.
+
+        Returns:
+            Optional[TaskAccess]: Задача с проектом и ролью (None, если пользователь не участник)
+                или None, если задача не найдена.
+        """
+        stmt = (
+            select(Task, Task.project_id, ProjectUser.role)
+            .outerjoin(
+                ProjectUser,
+                and_(ProjectUser.project_id == Task.project_id, ProjectUser.user_id == user_id)
+            )
+            .where(Task.id == task_id)
+        )
+        result = await self.session.execute(stmt)
+        row = result.one_or_none()
+        return TaskAccess(*row) if row else None
+
+    @staticmethod
+    def _task_filters(
             assignee_id: Optional[UUID] = None,
             producer_id: Optional[UUID] = None,
             column_id: Optional[UUID] = None,
             deadline: Optional[date] = None,
             title: Optional[str] = None
-    ) -> list[Task]:
-        column_ids = await self.session.execute(
-            select(self.model.column_id).where(self.model.column.has(project_id=project_id))
-        )
-        column_ids = column_ids.scalars().all()
-        filters = [Task.column_id.in_(column_ids)]
-
+    ) -> list:
+        filters = []
         if assignee_id:
             filters.append(Task.assignee_id == assignee_id)
         if producer_id:
@@ -33,7 +97,170 @@ class TaskDAO(BaseDAO):
         if deadline:
             filters.append(Task.deadline == deadline)
         if title:
-            filters.append(Task.title.ilike(f"%{title}%"))
-        stmt = select(Task).where(and_(*filters))
+            # Подстрока, а не шаблон: так же фильтрует закэшированную доску `TaskService._filter_board`
+            filters.append(Task.title.ilike(f"%{escape_like(title)}%", escape="/"))
+        return filters
+
+    async def find_filtered(
+            self,
+            project_id: UUID,
+            assignee_id: Optional[UUID] = None,
+            producer_id: Optional[UUID] = None,
+            column_id: Optional[UUID] = None,
+            deadline: Optional[date] = None,
+            title: Optional[str] = None
+    ) -> list[Task]:
+        stmt = (
+            select(Task)
+            .where(
+                Task.project_id == project_id,
+                *self._task_filters(assignee_id, producer_id, column_id, deadline, title)
+            )
+        )
         result = await self.session.execute(stmt)
         return result.scalars().all()
+
+    async def get_board(
+            self,
+            project_id: UUID,
+            assignee_id: Optional[UUID] = None,
+            producer_id: Optional[UUID] = None,
+            column_id: Optional[UUID] = None,
+            deadline: Optional[date] = None,
+            title: Optional[str] = None,
+            q: Optional[str] = None
+    ) -> list[Row]:
+        """
+        Получает доску проекта одним запросом: все колонки и отфильтрованные задачи в них.
+
+        Фильтры задач применяются в условии LEFT JOIN, поэтому колонки без подходящих
+        задач тоже возвращаются (с полями задачи None). Если задан полнотекстовый запрос `q`,
+        задачи внутри колонки упорядочены по релевантности.
+
+        Выбираются только колонки, нужные для ответа, без загрузки ORM-сущностей.
+
+        Returns:
+            list[Row]: Строки с полями `board_column_id`, `board_column_name` и полями
+                `TaskResponse`, упорядоченные по рангу колонки; строки одной колонки идут
+                подряд в порядке рангов задач.
+        """
+        filters = self._task_filters(assignee_id, producer_id, column_id, deadline, title)
+        order_by = [Column.rank, Column.id]
+        if q is not None:
+            condition, score = search_condition(q)
+            if condition is not None:
+                filters.append(condition)
+                order_by.append(score.desc())
+        order_by.extend([Task.rank, Task.id])
+
+        stmt = (
+            select(
+                Column.id.label("board_column_id"),
+                Column.name.label("board_column_name"),
+                *columns_for(Task, TaskResponse)
+            )
+            .select_from(Column)
+            .outerjoin(
+                Task,
+                and_(Task.project_id == project_id, Task.column_id == Column.id, *filters)
+            )
+            .where(Column.project_id == project_id)
+            .order_by(*order_by)
+        )
+        result = await self.session.execute(stmt)
+        return result.all()
+
+    async def lock_rank_scope(self, column_id: UUID, **scope) -> None:
+        """
+        Заблокировать проект колонки: ранги задач колонки меняются только под этой блокировкой.
+
+        Блокируется строка проекта, а не колонки, чтобы порядок блокировок совпадал
+        с изменениями колонок и `ProjectDAO.bump_version` (см. `ProjectDAO.lock`).
+
+        Args:
+            column_id (UUID): Колонка, в которой вычисляются ранги.
+        """
+        await self.session.execute(
+            select(Project.id)
+            .join(Column, Column.project_id == Project.id)
+            .where(Column.id == column_id)
+            .with_for_update(of=Project, key_share=True)
+        )
+
+    async def rank_next_to(
+            self,
+            task_id: UUID,
+            column_id: UUID,
+            after_id: Optional[UUID] = None,
+            before_id: Optional[UUID] = None
+    ) -> Optional[str]:
+        """
+        Ранг для перемещения задачи в колонку между указанными соседями.
+
+        Если задан только один сосед, второй определяется по рангам в колонке;
+        если не задан ни один, задача ставится в конец колонки.
+
+        Args:
+            task_id (UUID): Идентификатор перемещаемой задачи.
+            column_id (UUID): Колонка назначения.
+            after_id (UUID, optional): Задача, после которой встаёт перемещаемая.
+            before_id (UUID, optional): Задача, перед которой встаёт перемещаемая.
+
+        Returns:
+            Optional[str]: Новый ранг или None, если соседи не найдены в колонке
+                или переданы в неверном порядке.
+
+        Raises:
+            ValueError: Если ранги соседей совпадают (нужна ребалансировка колонки).
+        """
+        if after_id is None and before_id is None:
+            return await self.rank_at(exclude_id=task_id, column_id=column_id)
+
+        await self.lock_rank_scope(column_id=column_id)
+        ids = [i for i in (after_id, before_id) if i is not None]
+        result = await self.session.execute(
+            select(Task.id, Task.rank).where(Task.id.in_(ids), Task.column_id == column_id)
+        )
+        ranks = dict(result.tuples().all())
+        if len(ranks) != len(ids):
+            return None
+
+        lower, upper = ranks.get(after_id), ranks.get(before_id)
+        others = select(Task.rank).where(Task.column_id == column_id, Task.id != task_id)
+        if upper is None:
+            upper = await self.session.scalar(others.where(Task.rank > lower).order_by(Task.rank).limit(1))
+            if upper is None:
+                return rank_after(lower)
+        elif lower is None:
+            lower = await self.session.scalar(others.where(Task.rank < upper).order_by(Task.rank.desc()).limit(1))
+        elif lower > upper:
+            return None
+        return rank_between(lower, upper)
+
+    async def search(self, user_id: UUID, q: str, limit: int) -> list[tuple[Task, UUID, float]]:
+        """
+        Ищет задачи во всех проектах пользователя с ранжированием по релевантности.
+
+        Args:
+            user_id (UUID): Идентификатор пользователя.
+            q (str): Поисковый запрос.
+            limit (int): Максимальное количество результатов.
+
+        Returns:
+            list[tuple[Task, UUID, float]]: Тройки (задача, id проекта, релевантность) по убыванию релевантности.
+        """
+        condition, score = search_condition(q)
+        if condition is None:
+            return []
+        stmt = (
+            select(Task, Task.project_id, score.label("score"))
+            .join(
+                ProjectUser,
+                and_(ProjectUser.project_id == Task.project_id, ProjectUser.user_id == user_id)
+            )
+            .where(condition)
+            .order_by(score.desc(), Task.id)
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        return result.tuples().all()
@@ -0,0 +1,25 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import select
+
+from src.dao.base import BaseDAO
+from src.models import TokenRevocation, User
+
+
+class TokenRevocationDAO(BaseDAO):
+    model = TokenRevocation
+
+    async def find_active(self) -> list[tuple[Optional[str], Optional[str], datetime]]:
+        """
+        Получить все действующие отзывы токенов.
+
+        :return: Список кортежей (jti, username, время отзыва).
+        """
+        stmt = (
+            select(TokenRevocation.jti, User.username, TokenRevocation.created_at)
+            .outerjoin(User, TokenRevocation.user_id == User.id)
+            .where(TokenRevocation.expires_at > datetime.utcnow())
+        )
+        result = await self.session.execute(stmt)
+        return result.tuples().all()
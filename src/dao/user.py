@@ -1,6 +1,29 @@
+from typing import Iterable
+from uuid import UUID
+
+from sqlalchemy import Row, Uuid, any_, bindparam, select
+from sqlalchemy.dialects.postgresql import ARRAY
+
 from src.dao.base import BaseDAO
+from src.dao.projection import columns_for
 from src.models import User
+from src.schemas.user import UserSchema
 
 
 class UserDAO(BaseDAO):
     model = User
+
+    async def find_by_ids(self, ids: Iterable[UUID]) -> list[Row]:
+        """
+        Найти пользователей по списку id одним запросом `WHERE id = ANY(:ids)`.
+
+        Один параметр-массив вместо списка `IN (...)`: текст запроса не зависит от числа id.
+
+        :param ids: Идентификаторы пользователей.
+        :return: Строки с полями `UserSchema` (отсутствующие id просто не попадают в результат).
+        """
+        stmt = select(*columns_for(User, UserSchema)).where(
+            User.id == any_(bindparam("ids", list(ids), type_=ARRAY(Uuid())))
+        )
+        result = await self.session.execute(stmt)
+        return result.all()
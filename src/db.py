@@ -1,4 +1,7 @@
-from typing import AsyncGenerator
+import asyncio
+import inspect
+from contextlib import asynccontextmanager
+from typing import Any, AsyncGenerator, Awaitable, Callable, Optional
 
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
@@ -24,6 +27,83 @@ class Base(DeclarativeBase):
     pass
 
 
+# Общий на процесс лимит соединений, которые run_concurrently берёт из пула сверх соединений запросов
+_read_semaphore = asyncio.Semaphore(settings.DB_READ_CONCURRENCY)
+
+
 async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
-    async with async_session_maker() as session:
+    """
+    Сессия БД на время запроса.
+
+    В режиме unit of work (`DB_UNIT_OF_WORK`) DAO только сбрасывают изменения в БД,
+    а фиксация выполняется один раз после обработчика. Если обработчик завершился
+    исключением (включая HTTPException), все изменения запроса откатываются.
+    """
+    if not settings.DB_UNIT_OF_WORK:
+        async with async_session_maker() as session:
+            yield session
+        return
+
+    async with unit_of_work() as session:
         yield session
+
+
+@asynccontextmanager
+async def unit_of_work() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Сессия, все изменения которой фиксируются одним коммитом при выходе из блока.
+
+    Используется запросами (см. `get_async_db`) и фоновыми задачами, которым нужна
+    одна транзакция на несколько DAO. При исключении изменения откатываются, а
+    колбэки `after_commit` выполняются только после успешного коммита.
+    """
+    async with async_session_maker() as session:
+        session.info["unit_of_work"] = True
+        try:
+            yield session
+        except Exception:
+            await session.rollback()
+            raise
+        # Для запросов без изменений COMMIT не нужен: транзакция откатится при закрытии сессии
+        if session.info.get("has_writes"):
+            await session.commit()
+        for callback in session.info.pop("after_commit", []):
+            result = callback()
+            if inspect.isawaitable(result):
+                await result
+
+
+def after_commit(session: AsyncSession, callback: Callable[[], Optional[Awaitable[None]]]) -> None:
+    """
+    Выполнить `callback` после фиксации изменений сессии.
+
+    В режиме unit of work вызов откладывается до коммита в конце запроса
+    (и не выполняется при откате), иначе выполняется сразу. Корутина, которую
+    вернул отложенный `callback`, дожидается до завершения запроса.
+    """
+    if session.info.get("unit_of_work"):
+        session.info.setdefault("after_commit", []).append(callback)
+    else:
+        callback()
+
+
+async def run_concurrently(*queries: Callable[[AsyncSession], Awaitable[Any]]) -> list:
+    """
+    Выполнить независимые запросы чтения параллельно, каждый в своей сессии из пула.
+
+    Одна AsyncSession не выполняет запросы одновременно, поэтому каждый запрос получает
+    отдельное соединение. Лимит `DB_READ_CONCURRENCY` общий для всех вызовов в процессе,
+    поэтому параллельные HTTP-запросы не могут выбрать весь пул. Запрос, который может
+    выполниться на сессии самого HTTP-запроса, лучше запускать там, а сюда передавать остальные.
+    Сессии не видят незафиксированных изменений текущего запроса и читают разные снимки БД,
+    поэтому подходят только для чтения данных, которые запрос не менял.
+
+    :param queries: Функции, принимающие сессию и возвращающие корутину с результатом.
+    :return: Результаты в порядке `queries`.
+    """
+    async def run(query: Callable[[AsyncSession], Awaitable[Any]]) -> Any:
+        async with _read_semaphore:
+            async with async_session_maker() as session:
+                return await query(session)
+
+    return list(await asyncio.gather(*(run(query) for query in queries)))
@@ -1,33 +1,49 @@
+import hashlib
+import logging
+import time
+from typing import Optional
+
 import jwt
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, Response, status
 from uuid import UUID
 
+from src.cache import principal_cache, membership_cache
 from src.config import settings
-from src.dao import UserDAO, ProjectUserDAO, TaskDAO
+from src.dao import UserDAO, ProjectDAO, ProjectUserDAO, TaskDAO, TokenRevocationDAO
+from src.dao.task import TaskAccess
 from src.models import User, ProjectUserRole
+from src.responses import construct
+from src.schemas.auth import Principal
 from src.service.auth import oauth2_scheme
+from src.service.revocation import revocation_list
 from src.dao.column import ColumnDAO
 
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
 
 
 async def get_current_user(
         access_token: str = Depends(oauth2_scheme),
-        db_user: UserDAO = Depends()
+        db_user: UserDAO = Depends(),
+        revocation_dao: TokenRevocationDAO = Depends()
 ) -> User:
     """Получение текущего пользователя из access токена.
 
+    Если включён `ACCESS_TOKEN_CLAIMS` и токен содержит профиль пользователя,
+    пользователь восстанавливается из claims без запроса к БД.
+
     Args:
         access_token (str): Access токен из заголовка Authorization
         db_user (UserDAO): DAO для работы с пользователями
+        revocation_dao (TokenRevocationDAO): DAO для периодической загрузки отозванных токенов
 
     Returns:
-        User: Модель пользователя
+        User: Модель пользователя (или Principal с теми же полями)
 
     Raises:
         HTTPException: 401 если токен невалидный, истек или пользователь не найден
     """
-    print(f"Received token: {access_token}")  # Логируем полученный токен
-
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -50,6 +66,30 @@ async def get_current_user(
         if not username:
             raise credentials_exception
 
+        await revocation_list.refresh_if_stale(revocation_dao)
+        if revocation_list.is_revoked(payload):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token has been revoked",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+
+        # Быстрый путь: профиль пользователя уже лежит в токене
+        if settings.ACCESS_TOKEN_CLAIMS and payload.get("uid"):
+            return Principal(
+                id=payload["uid"],
+                username=username,
+                name=payload["name"],
+                email=payload["email"],
+                created_at=payload["created_at"],
+            )
+
+        # Сначала смотрим в кэше, TTL записи не превышает оставшееся время жизни токена
+        cache_key = (username, payload.get("exp"))
+        user = principal_cache.get(cache_key)
+        if user:
+            return user
+
         # Ищем пользователя в БД
         user = await db_user.find_one_or_none(username=username)
         if not user:
@@ -60,32 +100,82 @@ async def get_current_user(
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-        print(f"Found user: {user.username}")
-        return user
+        # Кэшируем отвязанный от сессии снимок: ORM-объект истечёт при откате транзакции запроса
+        principal = construct(Principal, user)
+        if payload.get("exp"):
+            principal_cache.set(cache_key, principal, ttl=payload["exp"] - time.time())
+        return principal
 
     except jwt.ExpiredSignatureError as e:
-        print(f"Token expired: {str(e)}")
+        logger.debug("Access token expired: %s", e)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token has expired",
             headers={"WWW-Authenticate": "Bearer"},
         )
     except jwt.InvalidTokenError as e:
-        print(f"Invalid token: {str(e)}")
+        logger.debug("Invalid access token: %s", e)
         raise credentials_exception
+    except HTTPException:
+        raise
     except Exception as e:
-        # Логируем неожиданные ошибки
-        print(f"Unexpected error during token validation: {str(e)}")
-        print(f"Token that caused error: {token}")
+        # Сам токен в лог не пишем: это учётные данные
+        logger.exception("Unexpected error during token validation: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error during token validation"
         )
 
-async def get_project_user(
+async def resolve_project_role(
+        project_user_dao: ProjectUserDAO,
+        project_id: UUID,
+        user_id: UUID
+) -> Optional[ProjectUserRole]:
+    """
+    Получение роли пользователя в проекте с учётом межзапросного кэша.
+
+    Отрицательный результат тоже кэшируется: приглашение, смена роли и удаление
+    участника сбрасывают соответствующую запись (см. `invalidate_membership`).
+
+    Args:
+        project_user_dao (ProjectUserDAO): DAO для доступа к связям проект-пользователь.
+        project_id (UUID): Идентификатор проекта.
+        user_id (UUID): Идентификатор пользователя.
+
+    Returns:
+        Optional[ProjectUserRole]: Роль участника или None, если пользователь не состоит в проекте.
+    """
+    cache_key = (project_id, user_id)
+    role = membership_cache.get(cache_key, _MISSING)
+    if role is _MISSING:
+        role = await project_user_dao.get_role(project_id, user_id)
+        membership_cache.set(cache_key, role)
+    return role
+
+async def get_project_role(
         project_id: UUID,
         user: User = Depends(get_current_user),
         project_user_dao: ProjectUserDAO = Depends()
+) -> Optional[ProjectUserRole]:
+    """
+    Роль текущего пользователя в проекте.
+
+    FastAPI кэширует результат зависимости в пределах запроса, поэтому
+    цепочка get_project_user -> get_project_admin_user выполняет проверку один раз.
+
+    Args:
+        project_id (UUID): Идентификатор проекта.
+        user (User): Аутентифицированный пользователь.
+        project_user_dao (ProjectUserDAO): DAO для доступа к связям проект-пользователь.
+
+    Returns:
+        Optional[ProjectUserRole]: Роль участника или None, если пользователь не состоит в проекте.
+    """
+    return await resolve_project_role(project_user_dao, project_id, user.id)
+
+async def get_project_user(
+        user: User = Depends(get_current_user),
+        role: Optional[ProjectUserRole] = Depends(get_project_role)
 ) -> User:
     """
     Проверка, что пользователь является участником указанного проекта.
@@ -94,9 +184,8 @@ async def get_project_user(
     (включая пользователей с любыми ролями: viewer, member, admin, owner).
 
     Args:
-        project_id (UUID): Идентификатор проекта.
         user (User): Аутентифицированный пользователь.
-        project_user_dao (ProjectUserDAO): DAO для доступа к связям проект-пользователь.
+        role (Optional[ProjectUserRole]): Роль пользователя в проекте.
 
     Returns:
         User: Пользователь, если он является участником проекта.
@@ -105,8 +194,7 @@ async def get_project_user(
         HTTPException:
             404 — если пользователь не состоит в проекте.
     """
-    project_member = await project_user_dao.check_member(project_id, user.id)
-    if not project_member:
+    if not role:
         raise HTTPException(
             status_code=404,
             detail="User is not a member of this project"
@@ -114,9 +202,8 @@ async def get_project_user(
     return user
 
 async def get_project_admin_user(
-        project_id: UUID,
         user: User = Depends(get_project_user),
-        project_user_dao: ProjectUserDAO = Depends()
+        role: Optional[ProjectUserRole] = Depends(get_project_role)
 ) -> User:
     """
     Проверка, что пользователь является администратором или владельцем проекта.
@@ -125,9 +212,8 @@ async def get_project_admin_user(
     пользователям с ролью admin или owner.
 
     Args:
-        project_id (UUID): Идентификатор проекта.
         user (User): Пользователь, прошедший проверку участия в проекте.
-        project_user_dao (ProjectUserDAO): DAO для доступа к связям проект-пользователь.
+        role (Optional[ProjectUserRole]): Роль пользователя в проекте.
 
     Returns:
         User: Пользователь с правами администратора или владельца проекта.
@@ -136,9 +222,7 @@ async def get_project_admin_user(
         HTTPException:
             403 — если роль пользователя недостаточна для выполнения действия.
     """
-    project_member = await project_user_dao.check_member(project_id, user.id)
-
-    if project_member.role not in [ProjectUserRole.admin, ProjectUserRole.owner]:
+    if role not in [ProjectUserRole.admin, ProjectUserRole.owner]:
         raise HTTPException(
             status_code=403,
             detail="Only project owner or admin can perform this action"
@@ -147,9 +231,8 @@ async def get_project_admin_user(
     return user
 
 async def get_project_owner_user(
-        project_id: UUID,
         user: User = Depends(get_project_user),
-        project_user_dao: ProjectUserDAO = Depends()
+        role: Optional[ProjectUserRole] = Depends(get_project_role)
 ) -> User:
     """
     Проверка, что пользователь является владельцем проекта.
@@ -158,9 +241,8 @@ async def get_project_owner_user(
     пользователям с ролью admin или owner.
 
     Args:
-        project_id (UUID): Идентификатор проекта.
         user (User): Пользователь, прошедший проверку участия в проекте.
-        project_user_dao (ProjectUserDAO): DAO для доступа к связям проект-пользователь.
+        role (Optional[ProjectUserRole]): Роль пользователя в проекте.
 
     Returns:
         User: Пользователь с правами владельца проекта.
@@ -169,9 +251,7 @@ async def get_project_owner_user(
         HTTPException:
             403 — если роль пользователя недостаточна для выполнения действия.
     """
-    project_member = await project_user_dao.check_member(project_id, user.id)
-
-    if project_member.role != ProjectUserRole.owner:
+    if role != ProjectUserRole.owner:
         raise HTTPException(
             status_code=403,
             detail="Only project owner can perform this action"
@@ -179,53 +259,104 @@ async def get_project_owner_user(
 
     return user
 
-async def get_current_user_by_task_id_and_check_admin(
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Слабое сравнение ETag из заголовка If-None-Match (список через запятую или `*`)."""
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag.removeprefix("W/")
+        for candidate in if_none_match.split(",")
+    )
+
+async def check_project_etag(
+        project_id: UUID,
+        request: Request,
+        response: Response,
+        user: User = Depends(get_project_user),
+        project_dao: ProjectDAO = Depends()
+) -> int:
+    """
+    Условный GET для данных проекта по его версии.
+
+    ETag строится из версии проекта, пути и параметров запроса, поэтому разные фильтры
+    и страницы одного проекта имеют разные ETag. Если клиент прислал совпадающий
+    If-None-Match, запрос завершается ответом 304 сразу после чтения версии.
+
+    Args:
+        project_id (UUID): Идентификатор проекта.
+        request (Request): Текущий запрос.
+        response (Response): Ответ, в который добавляется заголовок ETag.
+        user (User): Участник проекта (проверка доступа выполняется до сравнения ETag).
+        project_dao (ProjectDAO): DAO проектов.
+
+    Returns:
+        int: Текущая версия проекта.
+
+    Raises:
+        HTTPException:
+            304 — если ETag клиента совпадает с текущим.
+            404 — если проект не найден.
+    """
+    version = await project_dao.get_version(project_id)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    query = "&".join(sorted(f"{key}={value}" for key, value in request.query_params.multi_items()))
+    digest = hashlib.blake2b(f"{request.url.path}?{query}".encode(), digest_size=8).hexdigest()
+    etag = f'W/"{version}-{digest}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
+    return version
+
+async def get_task_access(
     task_id: UUID,
     current_user: User = Depends(get_current_user),
     task_dao: TaskDAO = Depends(TaskDAO),
-    column_dao: ColumnDAO = Depends(ColumnDAO),
-    project_user_dao: ProjectUserDAO = Depends(ProjectUserDAO),
+) -> TaskAccess:
+    """
+    Получает задачу, её проект и роль текущего пользователя одним запросом.
+
+    Результат кэшируется FastAPI в пределах запроса и может передаваться в сервис,
+    чтобы тот не запрашивал задачу повторно.
+
+    Raises:
+        HTTPException: 404 — если задача не найдена
+    """
+    access = await task_dao.find_with_access(task_id, current_user.id)
+    if not access:
+        raise HTTPException(status_code=404, detail="Task not found")
+    membership_cache.set((access.project_id, current_user.id), access.role)
+    return access
+
+async def get_current_user_by_task_id_and_check_admin(
+    current_user: User = Depends(get_current_user),
+    access: TaskAccess = Depends(get_task_access),
 ) -> User:
     """
     Проверяет, что пользователь является админом или владельцем проекта по task_id.
     Используется для эндпоинтов, где требуется доступ к задаче только для админа/владельца проекта.
     """
-    task = await task_dao.find_by_id(task_id)
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-    column = await column_dao.find_by_id(task.column_id)
-    if not column:
-        raise HTTPException(status_code=404, detail="Column not found")
-    project_id = column.project_id
     # Проверяем, что пользователь — админ или владелец проекта
-    project_user = await project_user_dao.check_member(project_id, current_user.id)
-    if not project_user or project_user.role not in [ProjectUserRole.admin, ProjectUserRole.owner]:
+    if access.role not in [ProjectUserRole.admin, ProjectUserRole.owner]:
         raise HTTPException(status_code=403, detail="Not enough permissions")
     return current_user
 
 async def can_change_task_column(
-    task_id: UUID,
     current_user: User = Depends(get_current_user),
-    task_dao: TaskDAO = Depends(TaskDAO),
-    column_dao: ColumnDAO = Depends(ColumnDAO),
-    project_user_dao: ProjectUserDAO = Depends(ProjectUserDAO),
+    access: TaskAccess = Depends(get_task_access),
 ) -> User:
     """
     Проверяет, что пользователь может менять колонку задачи:
     - либо он админ/владелец проекта,
     - либо он исполнитель задачи.
     """
-    task = await task_dao.find_by_id(task_id)
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-    column = await column_dao.find_by_id(task.column_id)
-    if not column:
-        raise HTTPException(status_code=404, detail="Column not found")
-    project_id = column.project_id
-
-    project_user = await project_user_dao.check_member(project_id, current_user.id)
-    is_admin_or_owner = project_user and project_user.role in [ProjectUserRole.admin, ProjectUserRole.owner]
-    is_assignee = task.assignee_id == current_user.id
+    is_admin_or_owner = access.role in [ProjectUserRole.admin, ProjectUserRole.owner]
+    is_assignee = access.task.assignee_id == current_user.id
     if not (is_admin_or_owner or is_assignee):
         raise HTTPException(status_code=403, detail="Not enough permissions")
     return current_user
@@ -256,7 +387,7 @@ async def get_project_admin_by_column(
     if not column:
         raise HTTPException(status_code=404, detail="Column not found")
     project_id = column.project_id
-    project_member = await project_user_dao.check_member(project_id, user.id)
-    if not project_member or project_member.role not in [ProjectUserRole.admin, ProjectUserRole.owner]:
+    role = await resolve_project_role(project_user_dao, project_id, user.id)
+    if role not in [ProjectUserRole.admin, ProjectUserRole.owner]:
         raise HTTPException(status_code=403, detail="Not enough permissions")
     return user
@@ -0,0 +1,139 @@
+"""
+Проверка того, что фильтры DAO попадают в индексы.
+
+Фильтр по модели считается покрытым, если хотя бы одна из колонок, по которым
+он фильтрует, является первой колонкой первичного ключа, уникального ограничения
+или индекса таблицы.
+
+Запуск статической проверки всех DAO (код возврата 1 при найденных проблемах):
+
+    python -m src.index_check
+"""
+import ast
+import logging
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable
+
+from sqlalchemy import Table
+
+from src.models import Base
+
+logger = logging.getLogger(__name__)
+
+DAO_DIR = Path(__file__).parent / "dao"
+
+
+def leading_columns(table: Table) -> set[str]:
+    """
+    Колонки, с которых начинается первичный ключ, уникальное ограничение или индекс таблицы.
+
+    :param table: Таблица SQLAlchemy.
+    :return: Множество имён колонок.
+    """
+    leading = set()
+    for constraint in [table.primary_key, *table.constraints, *table.indexes]:
+        columns = list(constraint.columns)
+        if columns:
+            leading.add(columns[0].name)
+    return leading
+
+
+def is_indexed(table: Table, columns: Iterable[str]) -> bool:
+    """Покрыт ли фильтр по `columns` хотя бы одним индексом таблицы."""
+    return bool(leading_columns(table) & set(columns))
+
+
+@lru_cache(maxsize=None)
+def warn_if_unindexed(table: Table, columns: frozenset[str]) -> None:
+    """
+    Один раз на каждую комбинацию колонок предупредить о фильтре без индекса.
+
+    Вызывается из `BaseDAO` для фильтров, переданных именованными аргументами.
+    """
+    if columns and not is_indexed(table, columns):
+        logger.warning(
+            "Filter on %s(%s) is not covered by any index",
+            table.name, ", ".join(sorted(columns)),
+        )
+
+
+def _models() -> dict[str, Table]:
+    return {mapper.class_.__name__: mapper.local_table for mapper in Base.registry.mappers}
+
+
+def _dao_model(class_node: ast.ClassDef, models: dict[str, Table]):
+    for node in class_node.body:
+        if isinstance(node, ast.Assign) and any(
+            isinstance(t, ast.Name) and t.id == "model" for t in node.targets
+        ) and isinstance(node.value, ast.Name):
+            return node.value.id if node.value.id in models else None
+    return None
+
+
+def _filtered_columns(func: ast.AST, dao_model: str, models: dict[str, Table]) -> dict[str, set[str]]:
+    """Собрать колонки, по которым фильтрует функция, сгруппированные по моделям."""
+    def is_model_attr(node: ast.AST) -> bool:
+        return (
+            isinstance(node, ast.Attribute)
+            and isinstance(node.value, ast.Name)
+            and node.value.id in models
+        )
+
+    filters: dict[str, set[str]] = {}
+    for node in ast.walk(func):
+        # Model.column == value, Model.column.in_(...); условия соединения Model.a == Other.b пропускаем
+        if isinstance(node, ast.Compare) and isinstance(node.ops[0], (ast.Eq, ast.In)):
+            if is_model_attr(node.comparators[0]):
+                continue
+            attr = node.left
+        elif isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr == "in_":
+            attr = node.func.value
+        # .filter_by(column=value) и self.find_*(column=value) относятся к модели DAO
+        elif (
+            dao_model
+            and isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Attribute)
+            and node.func.attr in ("filter_by", "find_one_or_none", "find_all")
+        ):
+            for keyword in node.keywords:
+                if keyword.arg and keyword.arg != "id":
+                    filters.setdefault(dao_model, set()).add(keyword.arg)
+            continue
+        else:
+            continue
+        if is_model_attr(attr) and attr.attr != "id":
+            filters.setdefault(attr.value.id, set()).add(attr.attr)
+    return filters
+
+
+def check_daos() -> list[str]:
+    """
+    Статически проверить методы всех DAO в `src/dao`.
+
+    :return: Список описаний фильтров, не покрытых индексами.
+    """
+    models = _models()
+    problems = []
+    for path in sorted(DAO_DIR.glob("*.py")):
+        tree = ast.parse(path.read_text(encoding="utf-8"))
+        for class_node in [n for n in tree.body if isinstance(n, ast.ClassDef)]:
+            dao_model = _dao_model(class_node, models)
+            for func in class_node.body:
+                if not isinstance(func, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    continue
+                for model, columns in _filtered_columns(func, dao_model, models).items():
+                    if not is_indexed(models[model], columns):
+                        problems.append(
+                            f"{path.name}:{func.lineno} {class_node.name}.{func.name}: "
+                            f"filter on {models[model].name}({', '.join(sorted(columns))}) has no index"
+                        )
+    return problems
+
+
+if __name__ == "__main__":
+    found = check_daos()
+    for problem in found:
+        print(problem)
+    sys.exit(1 if found else 0)
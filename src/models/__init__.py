@@ -1,6 +1,7 @@
 from src.models.base import BaseWithTimestamps, Base
-from src.models.enums import ProjectUserRole
+from src.models.enums import ProjectUserRole, LogEventType
 from src.models.user import User
-from src.models.project import Project, ProjectUser, ProjectLog
+from src.models.project import Project, ProjectUser, ProjectLog, ProjectLogDaily
 from src.models.task import Task
 from src.models.column import Column
+from src.models.token import TokenRevocation
@@ -1,6 +1,6 @@
 from uuid import UUID
 
-from sqlalchemy import String, ForeignKey
+from sqlalchemy import String, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.models.base import BaseWithTimestamps
@@ -8,11 +8,15 @@ from src.models.base import BaseWithTimestamps
 
 class Column(BaseWithTimestamps):
     __tablename__ = "columns"
+    __table_args__ = (
+        Index("ix_columns_project_id_rank", "project_id", "rank"),
+    )
 
     id: Mapped[UUID] = mapped_column(primary_key=True)
     project_id: Mapped[UUID] = mapped_column(ForeignKey("projects.id", ondelete="CASCADE"))
     name: Mapped[str] = mapped_column(String)
-    position: Mapped[int]
+    # Лексикографический ранг (см. src.rank), порядок колонок в проекте — по (rank, id)
+    rank: Mapped[str] = mapped_column(String(collation="C"))
     
     tasks: Mapped[list["Task"]] = relationship("Task", back_populates="column", cascade="all, delete-orphan")
     
\ No newline at end of file
@@ -10,3 +10,17 @@ class ProjectUserRole(enum.Enum):
 class InviteProjectUserRole(enum.Enum):
     admin = "admin"
     member = "member"
+
+
+class LogEventType(str, enum.Enum):
+    """Типы событий в логах проектов; значения совпадают с ранее записанными строками."""
+    project_create = "create"
+    member_invite = "member invite"
+    member_change_role = "member change role"
+    member_remove = "member remove"
+    column_create = "column create"
+    column_update = "column updated"
+    column_remove = "column removed"
+    task_create = "task create"
+    task_update = "task update"
+    task_move = "task move"
@@ -1,11 +1,13 @@
+import datetime
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import String, Text, ForeignKey, Enum
+from sqlalchemy import BigInteger, String, Text, ForeignKey, Enum, Index, Date
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.models.user import User
-from src.models.base import BaseWithTimestamps
+from src.models.base import BaseWithTimestamps, Base
 from src.models.enums import ProjectUserRole
 
 
@@ -15,25 +17,61 @@ class Project(BaseWithTimestamps):
     id: Mapped[UUID] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(String)
     description: Mapped[Optional[str]] = mapped_column(Text)
+    # Сколько дней хранить подробные логи проекта; None — значение по умолчанию (LOG_RETENTION_DAYS)
+    log_retention_days: Mapped[Optional[int]]
+    # Версия содержимого проекта (доска, колонки, участники), растёт при каждом изменении; основа ETag
+    version: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0")
 
 
 class ProjectUser(BaseWithTimestamps):
     __tablename__ = "project_users"
+    __table_args__ = (
+        Index("uq_project_users_project_id_user_id", "project_id", "user_id", unique=True),
+    )
 
     id: Mapped[UUID] = mapped_column(primary_key=True)
     project_id: Mapped[UUID] = mapped_column(ForeignKey("projects.id", ondelete="CASCADE"))
-    user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id"))
+    user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id"), index=True)
     role: Mapped[ProjectUserRole] = mapped_column(Enum(ProjectUserRole))
 
     user: Mapped[User] = relationship("User", backref="project_links")
 
 
 class ProjectLog(BaseWithTimestamps):
+    """
+    Лог проекта. Таблица секционирована по месяцам `created_at`
+    (секции создаёт и удаляет `src.service.log_maintenance`).
+    """
     __tablename__ = "project_logs"
+    __table_args__ = (
+        Index("ix_project_logs_project_id_created_at", "project_id", "created_at"),
+        Index("ix_project_logs_task_id_created_at", "task_id", "created_at"),
+        # jsonb_path_ops поддерживает только @>, зато индекс компактнее и быстрее
+        Index(
+            "ix_project_logs_payload", "payload",
+            postgresql_using="gin", postgresql_ops={"payload": "jsonb_path_ops"}
+        ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
     id: Mapped[UUID] = mapped_column(primary_key=True)
+    # Ключ секционирования обязан входить в первичный ключ
+    created_at: Mapped[datetime.datetime] = mapped_column(primary_key=True, default=datetime.datetime.utcnow)
     project_id: Mapped[Optional[UUID]] = mapped_column(ForeignKey("projects.id", ondelete="CASCADE"))
     task_id: Mapped[Optional[UUID]] = mapped_column(ForeignKey("tasks.id", ondelete="CASCADE"))
     user_id: Mapped[Optional[UUID]] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"))
+    # Значение LogEventType; в БД строка, чтобы не терять старые записи с другими типами
     type: Mapped[str] = mapped_column(String)
+    # Устаревшее текстовое описание, новые записи используют payload
     info: Mapped[Optional[str]] = mapped_column(Text)
+    payload: Mapped[Optional[dict]] = mapped_column(JSONB)
+
+
+class ProjectLogDaily(Base):
+    """Дневная сводка логов проекта по типам — остаётся после удаления подробных логов."""
+    __tablename__ = "project_log_daily"
+
+    project_id: Mapped[UUID] = mapped_column(ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    day: Mapped[datetime.date] = mapped_column(Date, primary_key=True)
+    type: Mapped[str] = mapped_column(String, primary_key=True)
+    count: Mapped[int]
@@ -2,7 +2,8 @@ import datetime
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import String, ForeignKey, Text, Date
+from sqlalchemy import String, ForeignKey, Text, Date, Computed, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.models.base import BaseWithTimestamps
@@ -10,13 +11,35 @@ from src.models.base import BaseWithTimestamps
 
 class Task(BaseWithTimestamps):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_project_id_column_id", "project_id", "column_id"),
+        Index("ix_tasks_column_id_rank", "column_id", "rank"),
+        Index("ix_tasks_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_tasks_title_trgm", "title",
+            postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}
+        ),
+    )
 
     id: Mapped[UUID] = mapped_column(primary_key=True)
     column_id: Mapped[UUID] = mapped_column(ForeignKey("columns.id", ondelete="CASCADE"))
+    # Денормализовано из колонки: обновляется при каждом перемещении задачи между колонками
+    project_id: Mapped[UUID] = mapped_column(ForeignKey("projects.id", ondelete="CASCADE"))
+    # Лексикографический ранг (см. src.rank), порядок задач в колонке — по (rank, id)
+    rank: Mapped[str] = mapped_column(String(collation="C"))
     title: Mapped[str] = mapped_column(String)
     description: Mapped[Optional[str]] = mapped_column(Text)
-    assignee_id: Mapped[Optional[UUID]] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"))
-    producer_id: Mapped[Optional[UUID]] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"))
+    assignee_id: Mapped[Optional[UUID]] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"), index=True)
+    producer_id: Mapped[Optional[UUID]] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"), index=True)
     deadline: Mapped[Optional[datetime.date]] = mapped_column(Date)
-    
+    # Поддерживается самой БД при вставке и обновлении, в обычных выборках не загружается
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(description, ''))",
+            persisted=True
+        ),
+        deferred=True
+    )
+
     column: Mapped["Column"] = relationship("Column", back_populates="tasks")
@@ -0,0 +1,19 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import String, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.base import BaseWithTimestamps
+
+
+class TokenRevocation(BaseWithTimestamps):
+    __tablename__ = "token_revocations"
+
+    id: Mapped[UUID] = mapped_column(primary_key=True)
+    # Отзыв конкретного токена по jti
+    jti: Mapped[Optional[str]] = mapped_column(String, index=True)
+    # Отзыв всех токенов пользователя, выпущенных до created_at
+    user_id: Mapped[Optional[UUID]] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
+    expires_at: Mapped[datetime]
@@ -0,0 +1,96 @@
+"""
+Лексикографические ранги для упорядочивания задач и колонок (в стиле LexoRank).
+
+Ранг — строка из цифр и строчных латинских букв, порядок задаётся обычным сравнением
+строк (в БД колонка с collation "C"). Между любыми двумя рангами всегда есть ещё один,
+поэтому перемещение элемента меняет только его собственную строку. Ранги никогда
+не оканчиваются на "0": иначе между "a" и "a0" не нашлось бы места.
+"""
+from typing import Optional
+
+DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+
+
+def rank_between(before: Optional[str], after: Optional[str]) -> str:
+    """
+    Ранг строго между двумя соседями.
+
+    :param before: Ранг предыдущего элемента или None, если элемент ставится в начало.
+    :param after: Ранг следующего элемента или None, если элемент ставится в конец.
+    :return: Новый ранг, по возможности короткий.
+    :raises ValueError: Если `before` не меньше `after`.
+    """
+    before = before or ""
+    if after is not None and before >= after:
+        raise ValueError(f"Rank {before!r} must be less than {after!r}")
+
+    result = []
+    i = 0
+    while True:
+        low = DIGITS.index(before[i]) if i < len(before) else 0
+        high = DIGITS.index(after[i]) if after is not None and i < len(after) else BASE
+        if low == high:
+            # Общий префикс соседей
+            result.append(DIGITS[low])
+            i += 1
+            continue
+        middle = (low + high) // 2
+        if middle > low:
+            result.append(DIGITS[middle])
+            return "".join(result)
+        # Соседние цифры: берём цифру `before`, дальше верхней границы уже нет
+        result.append(DIGITS[low])
+        after = None
+        i += 1
+
+
+def rank_after(before: Optional[str]) -> str:
+    """
+    Короткий ранг после `before` — для добавления в конец.
+
+    `rank_between(before, None)` делит пополам оставшийся промежуток, и при добавлении
+    подряд ранги удлиняются на символ каждые несколько вставок. Здесь ранг увеличивается
+    на единицу младшего разряда при той же длине, а когда длина исчерпана — длина удваивается.
+    Так длина растёт логарифмически от числа добавлений.
+
+    :param before: Ранг последнего элемента или None, если элементов нет.
+    :return: Новый ранг, больший `before`.
+    """
+    if not before:
+        return rank_between(None, None)
+    digits = [DIGITS.index(c) for c in before]
+    i = len(digits) - 1
+    while i >= 0 and digits[i] == BASE - 1:
+        digits[i] = 0
+        i -= 1
+    if i < 0:
+        # Все разряды максимальные: удваиваем длину, оставляя место для следующих добавлений
+        return before + "0" * (len(before) - 1) + "1"
+    digits[i] += 1
+    if digits[-1] == 0:
+        # Ранг не может оканчиваться на "0"
+        digits[-1] = 1
+    return "".join(DIGITS[d] for d in digits)
+
+
+def spread_ranks(count: int) -> list[str]:
+    """
+    Равномерно распределённые ранги одинаковой длины — для начального заполнения и ребалансировки.
+
+    :param count: Количество рангов.
+    :return: Возрастающий список рангов.
+    """
+    width = 1
+    while BASE ** width <= count * 2:
+        width += 1
+    step = BASE ** width // (count + 1)
+
+    ranks = []
+    for k in range(1, count + 1):
+        value, digits = step * k, []
+        for _ in range(width):
+            value, digit = divmod(value, BASE)
+            digits.append(DIGITS[digit])
+        ranks.append("".join(reversed(digits)).rstrip("0"))
+    return ranks
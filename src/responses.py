@@ -0,0 +1,70 @@
+"""
+Быстрая сериализация ответов.
+
+Если обработчик объявляет `response_model`, FastAPI повторно валидирует уже готовые
+Pydantic-объекты и сериализует их через `jsonable_encoder`. Для тяжёлых списков
+(доска, колонки, логи) обработчики возвращают готовый `Response`: байты строятся
+один раз через `TypeAdapter.dump_json`, а `response_model` остаётся только для OpenAPI.
+"""
+from functools import lru_cache
+from typing import Any, Optional, TypeVar
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+M = TypeVar("M", bound=BaseModel)
+
+# Заголовки, которые вычисляет сам ответ
+_OWN_HEADERS = {"content-length", "content-type"}
+
+
+@lru_cache
+def _adapter(type_: Any) -> TypeAdapter:
+    return TypeAdapter(type_)
+
+
+def construct(model: type[M], obj: Any, **values: Any) -> M:
+    """
+    Собрать схему из атрибутов ORM-объекта без валидации.
+
+    Годится только для плоских схем, поля которых совпадают с колонками модели по имени и типу.
+
+    :param model: Класс Pydantic-схемы.
+    :param obj: ORM-объект или любой объект с нужными атрибутами.
+    :param values: Значения полей, которые берутся не из `obj`.
+    :return: Экземпляр схемы.
+    """
+    fields = {name: getattr(obj, name) for name in model.model_fields if name not in values}
+    return model.model_construct(**fields, **values)
+
+
+def json_response(
+        content: Any,
+        type_: Any,
+        response: Optional[Response] = None,
+        status_code: int = 200,
+        **dump_options: Any
+) -> Response:
+    """
+    JSON-ответ, сериализованный по схеме `type_` без повторной валидации.
+
+    Вывод совпадает с тем, что FastAPI строит по `response_model=type_`.
+
+    :param content: Данные ответа (Pydantic-объекты, списки и т.п.).
+    :param type_: Тип ответа, как в `response_model`.
+    :param response: Response, внедрённый в обработчик; его заголовки (ETag, X-Next-Cursor)
+        переносятся в ответ, потому что FastAPI не объединяет их с возвращённым Response.
+    :param status_code: Код ответа.
+    :param dump_options: Дополнительные параметры `TypeAdapter.dump_json` (например, `exclude_unset`).
+    :return: Готовый ответ.
+    """
+    result = Response(
+        content=_adapter(type_).dump_json(content, **dump_options),
+        status_code=status_code,
+        media_type="application/json",
+    )
+    if response is not None:
+        for key, value in response.headers.items():
+            if key not in _OWN_HEADERS:
+                result.headers.append(key, value)
+    return result
@@ -1,10 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.security import OAuth2PasswordRequestForm
-from src.dao import UserDAO
+from src.dao import UserDAO, TokenRevocationDAO
 from src.dependencies import get_current_user
 from src.models import User
-from src.schemas import AuthResponse, CreateUserRequest, CreateUserResponse, RefreshTokenRequest
+from src.schemas import AuthResponse, CreateUserRequest, CreateUserResponse, RefreshTokenRequest, LogoutRequest
 from src.service.auth import AuthService, pwd_context, oauth2_scheme
+from src.service.revocation import revocation_list
 from fastapi import status
 
 router = APIRouter(tags=["Auth"])
@@ -18,7 +19,7 @@ async def register_user(
 
     if existing_user:
         raise HTTPException(status_code=400, detail="User is already registered")
-    user.password = AuthService.get_password_hash(user.password)
+    user.password = await AuthService.get_password_hash_async(user.password)
     user = await db_user.add(
         email=user.email,
         name=user.name,
@@ -43,18 +44,46 @@ async def login(
 
     user = await db_user.find_one_or_none(username=form_data.username)
 
-    if not user or not pwd_context.verify(form_data.password, user.hashed_password):
+    if not user or not await AuthService.verify_password_async(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid username or password"
         )
 
-    return AuthService.create_tokens({"sub": user.username})
+    return AuthService.create_tokens(AuthService.token_claims(user))
 
 
 
 @router.post("/refresh", summary="Refresh access token")
 async def refresh_token_api(
-    data: RefreshTokenRequest
+    data: RefreshTokenRequest,
+    db_user: UserDAO = Depends(),
+    revocation_dao: TokenRevocationDAO = Depends(),
 ) -> AuthResponse:
-    return await AuthService.refresh_access_token(data.refresh_token)
+    await revocation_list.refresh_if_stale(revocation_dao)
+    return await AuthService.refresh_access_token(data.refresh_token, db_user)
+
+
+@router.post("/logout", summary="Logout and revoke tokens", status_code=204)
+async def logout(
+    data: LogoutRequest = None,
+    access_token: str = Depends(oauth2_scheme),
+    user: User = Depends(get_current_user),
+    revocation_dao: TokenRevocationDAO = Depends(),
+):
+    await revocation_list.revoke_token(
+        revocation_dao, AuthService.get_token_payload(access_token.replace("Bearer ", ""))
+    )
+    if data and data.refresh_token:
+        await revocation_list.revoke_token(
+            revocation_dao, AuthService.get_token_payload(data.refresh_token, is_refresh=True)
+        )
+
+
+@router.post("/logout-all", summary="Revoke all tokens of the current user", status_code=204)
+async def logout_all(
+    user: User = Depends(get_current_user),
+    revocation_dao: TokenRevocationDAO = Depends(),
+):
+    """Выход на всех устройствах: отзывает все access и refresh токены пользователя, выпущенные до этого момента."""
+    await revocation_list.revoke_user(revocation_dao, user)
@@ -1,7 +1,10 @@
-from fastapi import APIRouter, Depends
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, Response
 from uuid import UUID
 
 from src.dependencies import (
+    check_project_etag,
     get_project_admin_user,
     get_project_user,
     get_project_admin_by_column,
@@ -9,19 +12,30 @@ from src.dependencies import (
 from src.schemas.column import ColumnCreate, ColumnUpdate, ColumnResponseShort
 
 from src.models import User
+from src.responses import json_response
 from src.service.column import ColumnService
 
 router = APIRouter(prefix="/column", tags=["Columns"])
 
 
-@router.get("/project/{project_id}", response_model=list[ColumnResponseShort])
+@router.get(
+    "/project/{project_id}",
+    response_model=list[ColumnResponseShort],
+    dependencies=[Depends(check_project_etag)]
+)
 async def get_columns_by_project(
     project_id: UUID,
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_project_user),
     column_service: ColumnService = Depends(ColumnService)
 ):
-    """Получить все колонки по project_id."""
-    return await column_service.get_by_project(project_id)
+    """Получить колонки по project_id. Курсор следующей страницы — в заголовке X-Next-Cursor."""
+    page = await column_service.get_by_project(project_id, limit=limit, cursor=cursor)
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return json_response(page.items, list[ColumnResponseShort], response)
 
 
 @router.post("/", response_model=ColumnResponseShort, status_code=201)
@@ -0,0 +1,92 @@
+import asyncio
+import json
+from typing import AsyncIterator
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+
+from src.config import settings
+from src.dao import ProjectUserDAO, TokenRevocationDAO, UserDAO
+from src.db import async_session_maker
+from src.dependencies import get_current_user, get_project_user, resolve_project_role
+from src.models import User
+from src.service.events import broker
+
+router = APIRouter(prefix="", tags=["Events"])
+
+
+def _ends_subscription(event: dict, user_id: UUID) -> bool:
+    """Событие об удалении самого подписчика из проекта: дальше он не должен получать события."""
+    return event["entity"] == "member" and event["action"] == "deleted" and event["id"] == str(user_id)
+
+
+@router.get("/{project_id}/events")
+async def project_events(
+        project_id: UUID,
+        current_user: User = Depends(get_project_user),
+) -> StreamingResponse:
+    """
+    Поток изменений доски проекта (Server-Sent Events).
+
+    Каждое событие — JSON с полями `project_id`, `entity`, `action`, `id` и `data`.
+    Событие `board`/`resync` означает, что клиент отстал и должен перезагрузить доску.
+    Каждые `REALTIME_HEARTBEAT_SECONDS` отправляется комментарий, чтобы прокси не закрывали соединение.
+    """
+
+    async def stream() -> AsyncIterator[str]:
+        with broker.subscribe(project_id) as queue:
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=settings.REALTIME_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                yield f"event: {event['entity']}.{event['action']}\ndata: {json.dumps(event)}\n\n"
+                if _ends_subscription(event, current_user.id):
+                    return
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/{project_id}/ws")
+async def project_events_ws(
+        websocket: WebSocket,
+        project_id: UUID,
+        token: str = Query(...),
+):
+    """
+    Поток изменений доски проекта по WebSocket.
+
+    Браузер не может передать заголовок Authorization при открытии WebSocket,
+    поэтому access токен передаётся в параметре `token`. Права проверяются один раз
+    при подключении; без доступа соединение закрывается с кодом 1008.
+    """
+    async with async_session_maker() as session:
+        try:
+            user = await get_current_user(token, UserDAO(session), TokenRevocationDAO(session))
+            role = await resolve_project_role(ProjectUserDAO(session), project_id, user.id)
+            await get_project_user(user, role)
+        except HTTPException as e:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=str(e.detail))
+            return
+
+    await websocket.accept()
+    with broker.subscribe(project_id) as queue:
+        try:
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=settings.REALTIME_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    await websocket.send_json({"entity": "heartbeat"})
+                    continue
+                await websocket.send_json(event)
+                if _ends_subscription(event, user.id):
+                    await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Removed from project")
+                    return
+        except WebSocketDisconnect:
+            pass
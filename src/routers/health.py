@@ -0,0 +1,19 @@
+from fastapi import APIRouter
+
+from src.service.log_writer import log_writer
+from src.service.password_pool import password_pool
+
+router = APIRouter(prefix="", tags=["Health"])
+
+
+@router.get("/metrics")
+async def get_metrics() -> dict:
+    """
+    Метрики процесса: загрузка пула хеширования паролей и очередь записи логов.
+
+    Значения относятся к текущему воркеру, а не ко всему приложению.
+    """
+    return {
+        "password_pool": password_pool.metrics(),
+        "log_writer": log_writer.metrics(),
+    }
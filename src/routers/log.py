@@ -1,9 +1,13 @@
-from fastapi import APIRouter, Depends
+import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, Response
 from uuid import UUID
 
 from src.dependencies import get_project_user, get_current_user_by_task_id_and_check_admin
-from src.models import ProjectUser, User
-from src.schemas.log import ProjectLogCreate, ProjectLogResponse
+from src.models import ProjectUser, User, LogEventType
+from src.responses import json_response
+from src.schemas.log import ProjectLogCreate, ProjectLogResponse, ProjectLogDailyResponse
 from src.service.log import ProjectLogService
 
 router = APIRouter(prefix="", tags=["Logs"])
@@ -11,17 +15,66 @@ router = APIRouter(prefix="", tags=["Logs"])
 @router.get("/project/{project_id}", response_model=list[ProjectLogResponse])
 async def get_logs_by_project(
     project_id: UUID,
+    response: Response,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    type: Optional[LogEventType] = None,
+    user_id: Optional[UUID] = None,
+    task_id: Optional[UUID] = None,
+    column_id: Optional[UUID] = None,
+    member_id: Optional[UUID] = None,
+    log_service: ProjectLogService = Depends(ProjectLogService),
+    current_user: User = Depends(get_project_user),
+):
+    """
+    Получить логи по проекту, от новых к старым, с фильтрами по типу события, автору,
+    задаче, колонке и участнику. Курсор следующей страницы — в заголовке X-Next-Cursor.
+    """
+    page = await log_service.get_by_project(
+        project_id,
+        limit=limit,
+        cursor=cursor,
+        type=type,
+        user_id=user_id,
+        task_id=task_id,
+        column_id=column_id,
+        member_id=member_id
+    )
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return json_response(page.items, list[ProjectLogResponse], response)
+
+@router.get("/project/{project_id}/daily", response_model=list[ProjectLogDailyResponse])
+async def get_daily_logs_by_project(
+    project_id: UUID,
+    since: Optional[datetime.date] = None,
+    until: Optional[datetime.date] = None,
     log_service: ProjectLogService = Depends(ProjectLogService),
     current_user: User = Depends(get_project_user),
 ):
-    """Получить все логи по проекту."""
-    return await log_service.get_by_project(project_id)
+    """Получить дневные сводки логов проекта по типам (сохраняются после удаления старых логов)."""
+    rows = await log_service.get_daily_by_project(project_id, since, until)
+    return json_response(rows, list[ProjectLogDailyResponse])
 
 @router.get("/task/{task_id}", response_model=list[ProjectLogResponse])
 async def get_logs_by_task(
     task_id: UUID,
+    response: Response,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    type: Optional[LogEventType] = None,
+    user_id: Optional[UUID] = None,
+    column_id: Optional[UUID] = None,
     log_service: ProjectLogService = Depends(ProjectLogService),
     _=Depends(get_current_user_by_task_id_and_check_admin),
 ):
-    """Получить все логи по задаче."""
-    return await log_service.get_by_task(task_id)
+    """
+    Получить логи по задаче, от новых к старым, с фильтрами по типу события, автору и колонке.
+    Курсор следующей страницы — в заголовке X-Next-Cursor.
+    """
+    page = await log_service.get_by_task(
+        task_id, limit=limit, cursor=cursor, type=type, user_id=user_id, column_id=column_id
+    )
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return json_response(page.items, list[ProjectLogResponse], response)
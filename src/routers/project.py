@@ -1,7 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from uuid import UUID
 
-from src.dependencies import get_current_user, get_project_admin_user, get_project_user, get_project_owner_user
+from src.dependencies import (
+    check_project_etag,
+    get_current_user,
+    get_project_admin_user,
+    get_project_user,
+    get_project_owner_user,
+)
 from src.models.enums import InviteProjectUserRole
 from src.service.project import ProjectService
 from src.schemas.project import (
@@ -26,14 +34,20 @@ async def create_project(
 
 @router.get("/my", response_model=list[ProjectResponseShort])
 async def get_my_projects(
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_user),
     project_service: ProjectService = Depends(ProjectService)
 ):
-    """Получить проекты текущего пользователя."""
-    return await project_service.get_my_projects(current_user.id)
+    """Получить проекты текущего пользователя. Курсор следующей страницы — в заголовке X-Next-Cursor."""
+    page = await project_service.get_my_projects(current_user.id, limit=limit, cursor=cursor)
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page.items
 
 
-@router.get("/{project_id}", response_model=ProjectResponse)
+@router.get("/{project_id}", response_model=ProjectResponse, dependencies=[Depends(check_project_etag)])
 async def get_project_members(
     project_id: UUID,
     current_user: User = Depends(get_project_user),
@@ -1,27 +1,52 @@
 import datetime
+from typing import Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from uuid import UUID
 
 from src.dependencies import (
+    check_project_etag,
+    get_current_user,
     get_project_admin_user,
     get_project_user,
     can_change_task_column,
-    get_current_user_by_task_id_and_check_admin
+    get_current_user_by_task_id_and_check_admin,
+    get_task_access
 )
+from src.dao.task import TaskAccess
 from src.schemas.task import (
     TaskCreate,
     TaskResponse,
     ProjectTaskResponse,
     TaskUpdate,
-    TaskColumnUpdate
+    TaskColumnUpdate,
+    TaskMove,
+    TaskSearchResponse
 )
 
 from src.models import User
+from src.responses import json_response
 from src.service.task import TaskService
 
 router = APIRouter(prefix="", tags=["Tasks"])
 
+EXPANDABLE_USER_FIELDS = frozenset({"assignee", "producer"})
+
+
+def parse_expand(
+        expand: Optional[str] = Query(
+            None, description="Раскрыть профили пользователей задач: assignee, producer (через запятую)"
+        )
+) -> frozenset[str]:
+    """Разбирает параметр `expand`; неизвестные поля — ошибка 400."""
+    if not expand:
+        return frozenset()
+    fields = frozenset(field.strip() for field in expand.split(",") if field.strip())
+    unknown = fields - EXPANDABLE_USER_FIELDS
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown expand fields: {', '.join(sorted(unknown))}")
+    return fields
+
 
 @router.post("/", response_model=TaskResponse, status_code=201)
 async def create_task(
@@ -33,26 +58,51 @@ async def create_task(
     return await task_service.create(task, current_user)
 
 
+@router.get("/search", response_model=list[TaskSearchResponse])
+async def search_tasks(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(get_current_user),
+    task_service: TaskService = Depends(TaskService)
+):
+    """Полнотекстовый поиск задач по всем проектам пользователя, с учётом опечаток в title."""
+    tasks = await task_service.search(current_user.id, q, limit)
+    return json_response(tasks, list[TaskSearchResponse])
+
+
 @router.get("/{project_id}", response_model=ProjectTaskResponse)
 async def get_tasks(
     project_id: UUID,
+    response: Response,
     assignee_id: UUID = None,
     producer_id: UUID = None,
     column_id: UUID = None,
     deadline: datetime.date = None,
     title: str = None,
+    q: str = Query(None, max_length=200),
     current_user: User = Depends(get_project_user),
+    expand: frozenset[str] = Depends(parse_expand),
+    version: int = Depends(check_project_etag),
     task_service: TaskService = Depends(TaskService)
 ):
-    """Получить задачи проекта с фильтрами по исполнителю, постановщику, колонке, дедлайну и title."""
-    return await task_service.get_by_project(
+    """
+    Получить задачи проекта с фильтрами по исполнителю, постановщику, колонке, дедлайну, title и полнотекстовым поиском q.
+    С `expand=assignee,producer` задачи содержат профили исполнителя и постановщика.
+    """
+    board = await task_service.get_by_project(
         project_id=project_id,
         assignee_id=assignee_id,
         producer_id=producer_id,
         column_id=column_id,
         deadline=deadline,
-        title=title
+        title=title,
+        q=q,
+        version=version
     )
+    if expand:
+        board = await task_service.expand_users(board, expand)
+        return json_response(board, ProjectTaskResponse, response, serialize_as_any=True, exclude_unset=True)
+    return json_response(board, ProjectTaskResponse, response)
 
 
 @router.patch("/{task_id}", response_model=TaskResponse)
@@ -60,10 +110,11 @@ async def update_task(
     task_id: UUID,
     task_update: TaskUpdate,
     current_user: User = Depends(get_current_user_by_task_id_and_check_admin),
+    access: TaskAccess = Depends(get_task_access),
     task_service: TaskService = Depends(TaskService)
 ):
     """Обновить существующую задачу."""
-    return await task_service.update(task_id, task_update, current_user.id)
+    return await task_service.update(task_id, task_update, current_user.id, access=access)
 
 
 @router.patch("/{task_id}/column", response_model=TaskResponse)
@@ -71,17 +122,31 @@ async def update_task_column(
     task_id: UUID,
     column_update: TaskColumnUpdate,
     current_user: User =Depends(can_change_task_column),
+    access: TaskAccess = Depends(get_task_access),
     task_service: TaskService = Depends(TaskService)
 ):
     """Переместить задачу в другую колонку (доступно админу/владельцу или исполнителю)."""
-    return await task_service.update(task_id, column_update, current_user.id)
+    return await task_service.update(task_id, column_update, current_user.id, access=access)
+
+
+@router.patch("/{task_id}/move", response_model=TaskResponse)
+async def move_task(
+    task_id: UUID,
+    task_move: TaskMove,
+    current_user: User = Depends(can_change_task_column),
+    access: TaskAccess = Depends(get_task_access),
+    task_service: TaskService = Depends(TaskService)
+):
+    """Переместить задачу между соседними задачами, в той же или другой колонке (доступно админу/владельцу или исполнителю)."""
+    return await task_service.move(task_id, task_move, current_user.id, access=access)
 
 
 @router.delete("/{task_id}", status_code=204)
 async def delete_task(
     task_id: UUID,
     current_user: User =Depends(get_current_user_by_task_id_and_check_admin),
+    access: TaskAccess = Depends(get_task_access),
     task_service: TaskService = Depends(TaskService)
 ):
     """Удалить задачу (доступно админу или владельцу проекта)."""
-    await task_service.delete(task_id, current_user.id)
+    await task_service.delete(task_id, current_user.id, access=access)
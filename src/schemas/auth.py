@@ -1,4 +1,6 @@
 from datetime import datetime
+from typing import Optional
+from uuid import UUID
 
 from pydantic import BaseModel, EmailStr
 
@@ -25,3 +27,16 @@ class CreateUserResponse(BaseModel):
 
 class RefreshTokenRequest(BaseModel):
     refresh_token: str
+
+
+class LogoutRequest(BaseModel):
+    refresh_token: Optional[str] = None
+
+
+class Principal(BaseModel):
+    """Аутентифицированный пользователь: из claims access токена или снимок строки users для кэша."""
+    id: UUID
+    username: str
+    name: str
+    email: str
+    created_at: datetime
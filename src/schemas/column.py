@@ -4,7 +4,8 @@ from typing import Optional
 
 class ColumnCreate(BaseModel):
     name: str
-    position: int
+    # Позиция (с нуля) среди колонок проекта; по умолчанию — в конец
+    position: Optional[int] = None
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
 class ColumnUpdate(BaseModel):
@@ -1,5 +1,5 @@
 from uuid import UUID
-from typing import Optional
+from typing import Any, Optional
 from pydantic import BaseModel, ConfigDict
 import datetime
 
@@ -9,8 +9,16 @@ class ProjectLogCreate(BaseModel):
     user_id: Optional[UUID]
     type: str
     info: Optional[str]
+    payload: Optional[dict[str, Any]] = None
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
+class ProjectLogDailyResponse(BaseModel):
+    project_id: UUID
+    day: datetime.date
+    type: str
+    count: int
+    model_config = ConfigDict(from_attributes=True)
+
 class ProjectLogResponse(ProjectLogCreate):
     id: UUID
     created_at: datetime.datetime
@@ -1,6 +1,6 @@
 from uuid import UUID
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from typing import Optional, List
 from datetime import datetime
 from src.models import ProjectUserRole
@@ -12,7 +12,8 @@ class ProjectBase(BaseModel):
     description: Optional[str] = None
 
 class ProjectCreate(ProjectBase):
-    pass
+    # Срок хранения подробных логов в днях; по умолчанию LOG_RETENTION_DAYS
+    log_retention_days: Optional[int] = Field(None, ge=1)
 
 class ProjectUpdate(ProjectBase):
     name: Optional[str] = None
@@ -4,6 +4,8 @@ from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict
 
+from src.schemas.user import UserSchema
+
 
 class TaskCreate(BaseModel):
     column_id: UUID
@@ -37,6 +39,17 @@ class TaskResponse(TaskCreate):
     )
 
 
+class TaskExpandedResponse(TaskResponse):
+    """Задача с профилями пользователей, запрошенными через `expand`; незапрошенные поля не выводятся."""
+    assignee: Optional[UserSchema] = None
+    producer: Optional[UserSchema] = None
+
+
+class TaskSearchResponse(TaskResponse):
+    project_id: UUID
+    score: float
+
+
 class ColumnResponse(BaseModel):
     id: UUID
     name: str
@@ -53,5 +66,15 @@ class TaskColumnUpdate(BaseModel):
     column_id: UUID
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
+
+class TaskMove(BaseModel):
+    # Колонка назначения; по умолчанию задача остаётся в своей колонке
+    column_id: Optional[UUID] = None
+    # Задача, после которой встаёт перемещаемая (соседка сверху)
+    after_id: Optional[UUID] = None
+    # Задача, перед которой встаёт перемещаемая (соседка снизу)
+    before_id: Optional[UUID] = None
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
 # class ProjectUpdate(ProjectBase):
 #     name: Optional[str] = None
\ No newline at end of file
@@ -1,15 +1,24 @@
+import logging
+import time
+import uuid
 from datetime import datetime, timedelta
 import jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from src.config import settings
+from src.dao import UserDAO
+from src.models import User
 from src.schemas import AuthResponse
+from src.service.password_pool import password_pool
+from src.service.revocation import revocation_list
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login")
 
+logger = logging.getLogger(__name__)
+
 class AuthService:
     @staticmethod
     def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -21,6 +30,29 @@ class AuthService:
         """Хеширование пароля"""
         return pwd_context.hash(password)
 
+    @staticmethod
+    async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+        """Проверка пароля в пуле потоков, не блокируя event loop"""
+        return await password_pool.run(pwd_context.verify, plain_password, hashed_password)
+
+    @staticmethod
+    async def get_password_hash_async(password: str) -> str:
+        """Хеширование пароля в пуле потоков, не блокируя event loop"""
+        return await password_pool.run(pwd_context.hash, password)
+
+    @staticmethod
+    def token_claims(user: User) -> dict:
+        """Данные пользователя, которые кладутся в токены"""
+        if not settings.ACCESS_TOKEN_CLAIMS:
+            return {"sub": user.username}
+        return {
+            "sub": user.username,
+            "uid": str(user.id),
+            "name": user.name,
+            "email": user.email,
+            "created_at": user.created_at.isoformat(),
+        }
+
     @staticmethod
     def create_tokens(data: dict) -> AuthResponse:
         """Создание access и refresh токенов"""
@@ -46,7 +78,8 @@ class AuthService:
         """Создание JWT токена"""
         to_encode = data.copy()
         expire = datetime.utcnow() + expires_delta
-        to_encode.update({"exp": expire})
+        # jti и iat нужны для отзыва токенов (см. TokenRevocationList)
+        to_encode.update({"exp": expire, "iat": time.time(), "jti": uuid.uuid4().hex})
         encoded_jwt = jwt.encode(to_encode, secret_key, algorithm=settings.ALGORITHM)
         return encoded_jwt
 
@@ -54,7 +87,7 @@ class AuthService:
     def get_token_payload(token: str, is_refresh: bool = False) -> dict:
         """Получение payload из токена"""
         try:
-            secret_key = settings.REFRESH_SECRET_KEY if is_refresh else settings.SECRET_KEY
+            secret_key = settings.REFRESH_SECRET_KEY if is_refresh else settings.ACCESS_SECRET_KEY
             return jwt.decode(token, secret_key, algorithms=[settings.ALGORITHM])
         except jwt.ExpiredSignatureError:
             raise HTTPException(
@@ -70,23 +103,35 @@ class AuthService:
             )
 
     @staticmethod
-    async def refresh_access_token(refresh_token: str) -> AuthResponse:
-        """Обновление access токена с помощью refresh токена"""
+    async def refresh_access_token(refresh_token: str, user_dao: UserDAO) -> AuthResponse:
+        """
+        Обновление access токена с помощью refresh токена.
+
+        Claims новых токенов строятся по текущей строке пользователя, а не копируются
+        из refresh токена: иначе изменённые имя и email не попали бы в токены до нового входа.
+        """
         try:
             payload = AuthService.get_token_payload(refresh_token, is_refresh=True)
             username: str = payload.get("sub")
-            if not username:
+            if not username or revocation_list.is_revoked(payload):
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="Invalid token payload",
                     headers={"WWW-Authenticate": "Bearer"},
                 )
 
-            return AuthService.create_tokens({"sub": username})
+            user = await user_dao.find_one_or_none(username=username)
+            if not user:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="User not found",
+                    headers={"WWW-Authenticate": "Bearer"},
+                )
+            return AuthService.create_tokens(AuthService.token_claims(user))
         except HTTPException:
             raise
         except Exception as e:
-            print(f"Unexpected error during token refresh: {str(e)}")
+            logger.exception("Unexpected error during token refresh: %s", e)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Internal server error during token refresh"
@@ -0,0 +1,166 @@
+"""
+Шина событий между процессами приложения.
+
+Сервисы публикуют события проектов в шину, а каждый процесс (воркер uvicorn, под)
+получает их и сбрасывает свои in-process кэши и пересылает события подписчикам SSE/WebSocket.
+
+Бэкенды (`EVENT_BUS_BACKEND`):
+- `memory` — в пределах одного процесса (один воркер, тесты);
+- `postgres` — через `pg_notify` в транзакции запроса и `LISTEN` на отдельном соединении asyncpg.
+"""
+import asyncio
+import json
+import logging
+from abc import ABC, abstractmethod
+from typing import Callable, Optional
+
+import asyncpg
+from sqlalchemy import func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.db import after_commit
+
+logger = logging.getLogger(__name__)
+
+# Postgres ограничивает payload NOTIFY 8000 байтами
+MAX_NOTIFY_BYTES = 7900
+
+EventHandler = Callable[[dict], None]
+
+
+class EventBus(ABC):
+    """
+    Базовая шина: хранит обработчики и вызывает их для каждого полученного события.
+
+    Подклассы реализуют `publish`; `start`/`stop` переопределяются, если бэкенду нужно соединение.
+    """
+
+    def __init__(self):
+        self._handlers: list[EventHandler] = []
+
+    def subscribe(self, handler: EventHandler) -> None:
+        """
+        Зарегистрировать обработчик событий.
+
+        :param handler: Синхронная функция, принимающая событие; вызывается в каждом процессе.
+        """
+        self._handlers.append(handler)
+
+    async def start(self) -> None:
+        """Начать получать события (вызывается при старте приложения)."""
+
+    async def stop(self) -> None:
+        """Перестать получать события."""
+
+    @abstractmethod
+    async def publish(self, session: AsyncSession, event: dict) -> None:
+        """
+        Опубликовать событие. Оно будет доставлено только после коммита транзакции сессии.
+
+        :param session: Сессия запроса, в транзакции которого произошло изменение.
+        :param event: Событие, пригодное для сериализации в JSON.
+        """
+
+    def dispatch(self, event: dict) -> None:
+        """Передать событие всем обработчикам; ошибка одного обработчика не мешает остальным."""
+        for handler in self._handlers:
+            try:
+                handler(event)
+            except Exception:
+                logger.exception("Event handler %r failed for %s", handler, event)
+
+
+class InMemoryEventBus(EventBus):
+    """Шина в пределах одного процесса."""
+
+    async def publish(self, session: AsyncSession, event: dict) -> None:
+        after_commit(session, lambda: self.dispatch(event))
+
+
+class PostgresEventBus(EventBus):
+    """
+    Шина через LISTEN/NOTIFY.
+
+    `pg_notify` выполняется в транзакции запроса, поэтому Postgres доставит событие
+    всем слушателям (включая этот процесс) только после коммита, а при откате не доставит.
+    Если соединение LISTEN оборвалось, после переподключения обработчики получают событие
+    `bus`/`reset`: пропущенные за это время события неизвестны, и кэши нужно сбросить целиком.
+    """
+
+    def __init__(self, dsn: str, channel: str):
+        """
+        :param dsn: Строка подключения asyncpg (без драйвера SQLAlchemy).
+        :param channel: Имя канала NOTIFY.
+        """
+        super().__init__()
+        self.dsn = dsn
+        self.channel = channel
+        self._connection: Optional[asyncpg.Connection] = None
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    async def start(self) -> None:
+        self._stopping = False
+        await self._connect()
+
+    async def stop(self) -> None:
+        self._stopping = True
+        if self._reconnect_task:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        if self._connection and not self._connection.is_closed():
+            await self._connection.close()
+        self._connection = None
+
+    async def _connect(self) -> None:
+        connection = await asyncpg.connect(self.dsn)
+        await connection.add_listener(self.channel, self._on_notify)
+        connection.add_termination_listener(self._on_terminated)
+        self._connection = connection
+
+    def _on_notify(self, connection, pid, channel, payload: str) -> None:
+        self.dispatch(json.loads(payload))
+
+    def _on_terminated(self, connection) -> None:
+        if not self._stopping:
+            logger.warning("Event bus LISTEN connection lost, reconnecting")
+            self._reconnect_task = asyncio.create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        delay = 1
+        while not self._stopping:
+            try:
+                await self._connect()
+            except Exception as e:
+                logger.warning("Event bus reconnect failed: %s", e)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30)
+                continue
+            self.dispatch({"entity": "bus", "action": "reset"})
+            return
+
+    async def publish(self, session: AsyncSession, event: dict) -> None:
+        payload = json.dumps(event)
+        if len(payload.encode()) > MAX_NOTIFY_BYTES:
+            # Полное состояние не помещается в NOTIFY: подписчики перечитают сущность сами
+            payload = json.dumps({**event, "data": None})
+        await session.execute(select(func.pg_notify(self.channel, payload)))
+        if session.info.get("unit_of_work"):
+            session.info["has_writes"] = True
+        else:
+            await session.commit()
+
+
+def create_event_bus() -> EventBus:
+    """Шина событий по настройке `EVENT_BUS_BACKEND`."""
+    if settings.EVENT_BUS_BACKEND == "postgres":
+        dsn = make_url(settings.DATABASE_URL).set(drivername="postgresql").render_as_string(hide_password=False)
+        return PostgresEventBus(dsn, channel=settings.EVENT_BUS_CHANNEL)
+    if settings.EVENT_BUS_BACKEND == "memory":
+        return InMemoryEventBus()
+    raise ValueError(f"Unknown EVENT_BUS_BACKEND: {settings.EVENT_BUS_BACKEND!r}")
+
+
+bus = create_event_bus()
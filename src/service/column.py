@@ -1,63 +1,135 @@
+from typing import Optional
 from uuid import UUID
 
-from fastapi import Depends, HTTPException
+from fastapi import BackgroundTasks, Depends, HTTPException
 
+from src.config import settings
 from src.dao import ColumnDAO, TaskDAO
+from src.dao.project import ProjectDAO
+from src.db import unit_of_work
+from src.models import Column, LogEventType
 from src.schemas.column import ColumnCreate, ColumnUpdate, ColumnResponseShort
+from src.schemas.pagination import Page
+from src.service.events import ProjectEventService
 from src.service.log import ProjectLogService
 
 
+async def rebalance_project_columns(project_id: UUID) -> None:
+    """Перераспределяет ранги колонок проекта в собственной сессии (фоновая задача) и публикует `board`/`rebalanced`."""
+    async with unit_of_work() as session:
+        if await ColumnDAO(session).rebalance(project_id=project_id):
+            await ProjectEventService(ProjectDAO(session)).publish(project_id, "board", "rebalanced")
+
+
 class ColumnService:
     def __init__(
             self,
             column_dao: ColumnDAO = Depends(),
             task_dao: TaskDAO = Depends(TaskDAO),
-            log_service: ProjectLogService = Depends()
+            project_dao: ProjectDAO = Depends(),
+            log_service: ProjectLogService = Depends(),
+            events: ProjectEventService = Depends(),
+            background_tasks: BackgroundTasks = None
     ):
         self.log_service: ProjectLogService = log_service
+        self.events = events
         self.column_dao = column_dao
         self.task_dao: TaskDAO = task_dao
+        self.project_dao = project_dao
+        self.background_tasks = background_tasks
+
+    async def _to_response(self, db_column: Column, position: Optional[int] = None) -> ColumnResponseShort:
+        """Ответ с позицией колонки, вычисленной по её рангу, если позиция не известна заранее."""
+        if position is None:
+            position = await self.column_dao.position_of(db_column, project_id=db_column.project_id)
+        return ColumnResponseShort(
+            id=db_column.id,
+            project_id=db_column.project_id,
+            name=db_column.name,
+            position=position
+        )
+
+    async def _rank_at(self, project_id: UUID, position: Optional[int], column_id: Optional[UUID] = None) -> str:
+        """Ранг для позиции `position`; при слишком длинном ранге планирует ребалансировку проекта."""
+        try:
+            rank = await self.column_dao.rank_at(position, exclude_id=column_id, project_id=project_id)
+        except ValueError:
+            self._schedule_rebalance(project_id)
+            raise HTTPException(status_code=409, detail="Column order changed concurrently, retry")
+        if len(rank) > settings.RANK_REBALANCE_LENGTH:
+            self._schedule_rebalance(project_id)
+        return rank
+
+    def _schedule_rebalance(self, project_id: UUID) -> None:
+        if self.background_tasks is not None:
+            self.background_tasks.add_task(rebalance_project_columns, project_id)
 
     async def create(self, column: ColumnCreate, project_id: UUID, user_id: UUID) -> ColumnResponseShort:
-        db_column = await self.column_dao.add(**column.model_dump(), project_id=project_id)
+        rank = await self._rank_at(project_id, column.position)
+        db_column = await self.column_dao.add(name=column.name, project_id=project_id, rank=rank)
 
         await self.log_service.add_log(
             project_id=project_id,
             user_id=user_id,
-            type="column create",
-            info=f"{db_column.id}"
+            type=LogEventType.column_create,
+            payload={"column_id": db_column.id, "name": db_column.name}
         )
 
-        return ColumnResponseShort.model_validate(db_column, from_attributes=True)
+        response = await self._to_response(db_column)
+        await self.events.publish(project_id, "column", "created", db_column.id, response)
+        return response
 
     async def get(self, column_id: UUID) -> ColumnResponseShort:
         db_column = await self.column_dao.find_by_id(column_id)
         if not db_column:
             raise HTTPException(status_code=404, detail="Column not found")
-        return ColumnResponseShort.model_validate(db_column, from_attributes=True)
+        return await self._to_response(db_column)
 
-    async def get_by_project(self, project_id: UUID) -> list[ColumnResponseShort]:
-        columns = await self.column_dao.find_all(project_id=project_id)
-        return [ColumnResponseShort.model_validate(c, from_attributes=True) for c in columns]
+    async def get_by_project(
+            self,
+            project_id: UUID,
+            limit: int = 100,
+            cursor: Optional[str] = None
+    ) -> Page[ColumnResponseShort]:
+        columns, next_cursor = await self.column_dao.find_page_by_project(project_id, limit, cursor)
+        # Позиции на странице идут подряд, поэтому считаем только позицию первой колонки
+        start = await self.column_dao.position_of(columns[0], project_id=project_id) if cursor and columns else 0
+        return Page(
+            items=[await self._to_response(c, start + i) for i, c in enumerate(columns)],
+            next_cursor=next_cursor
+        )
 
     async def update(self, column_id: UUID, column_update: ColumnUpdate, user_id: UUID) -> ColumnResponseShort:
-        db_column = await self.column_dao.update(column_id, **column_update.model_dump(exclude_unset=True))
+        update_data = column_update.model_dump(exclude_unset=True)
+        db_column = await self.column_dao.find_by_id(column_id)
+        if not db_column:
+            raise HTTPException(status_code=404, detail="Column not found")
+        # Строка проекта блокируется раньше строки колонки (см. ProjectDAO.lock)
+        await self.project_dao.lock(db_column.project_id)
+        if "position" in update_data:
+            # Перемещение меняет только ранг самой колонки
+            update_data["rank"] = await self._rank_at(db_column.project_id, update_data.pop("position"), column_id)
+
+        db_column = await self.column_dao.update(column_id, **update_data)
         if not db_column:
             raise HTTPException(status_code=404, detail="Column not found")
 
         await self.log_service.add_log(
             project_id=db_column.project_id,
             user_id=user_id,
-            type="column updated",
-            info=f"{db_column.id} {str(column_update.model_dump(exclude_unset=True))}"
+            type=LogEventType.column_update,
+            payload={"column_id": db_column.id, "changes": column_update.model_dump(exclude_unset=True)}
         )
 
-        return ColumnResponseShort.model_validate(db_column, from_attributes=True)
+        response = await self._to_response(db_column)
+        await self.events.publish(db_column.project_id, "column", "updated", db_column.id, response)
+        return response
 
     async def delete(self, column_id: UUID, user_id: UUID) -> None:
         db_column = await self.column_dao.find_by_id(column_id)
         if not db_column:
             raise HTTPException(status_code=404, detail="Column not found")
+        await self.project_dao.lock(db_column.project_id)
 
         tasks = await self.task_dao.find_all(column_id=db_column.id)
         if tasks:
@@ -67,6 +139,7 @@ class ColumnService:
         await self.log_service.add_log(
             project_id=db_column.project_id,
             user_id=user_id,
-            type="column removed",
-            info=f"{db_column.id}"
+            type=LogEventType.column_remove,
+            payload={"column_id": db_column.id}
         )
+        await self.events.publish(db_column.project_id, "column", "deleted", db_column.id)
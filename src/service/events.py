@@ -0,0 +1,140 @@
+import asyncio
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+from uuid import UUID
+
+from fastapi import Depends
+from fastapi.encoders import jsonable_encoder
+
+from src.cache import board_cache, invalidate_board, invalidate_membership, membership_cache
+from src.config import settings
+from src.dao.project import ProjectDAO
+from src.service.bus import bus
+
+
+class ProjectEventBroker:
+    """
+    In-process pub/sub событий проектов.
+
+    У каждого подписчика своя ограниченная очередь. Если подписчик не успевает читать
+    и очередь переполнилась, накопленные события отбрасываются и вместо них отправляется
+    одно событие `resync`: клиент должен перезагрузить доску целиком.
+    """
+
+    def __init__(self, queue_size: int):
+        """
+        :param queue_size: Максимальное количество непрочитанных событий у одного подписчика.
+        """
+        self.queue_size = queue_size
+        self._subscribers: dict[UUID, set[asyncio.Queue]] = {}
+
+    @contextmanager
+    def subscribe(self, project_id: UUID) -> Iterator[asyncio.Queue]:
+        """
+        Подписаться на события проекта на время блока `with`.
+
+        :param project_id: Идентификатор проекта.
+        :return: Очередь, в которую будут приходить события.
+        """
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(project_id, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            subscribers = self._subscribers.get(project_id)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    del self._subscribers[project_id]
+
+    def publish(self, project_id: UUID, event: dict) -> None:
+        """
+        Разослать событие всем подписчикам проекта в этом процессе.
+
+        :param project_id: Идентификатор проекта.
+        :param event: Событие, пригодное для сериализации в JSON.
+        """
+        for queue in self._subscribers.get(project_id, ()):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait({"project_id": str(project_id), "entity": "board", "action": "resync"})
+
+    def resync_all(self) -> None:
+        """Попросить всех подписчиков перезагрузить доски (например, если часть событий потеряна)."""
+        for project_id in list(self._subscribers):
+            self.publish(project_id, {"project_id": str(project_id), "entity": "board", "action": "resync"})
+
+    def subscriber_count(self, project_id: Optional[UUID] = None) -> int:
+        """Количество подписчиков проекта или всех проектов."""
+        if project_id is not None:
+            return len(self._subscribers.get(project_id, ()))
+        return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+
+broker = ProjectEventBroker(queue_size=settings.REALTIME_QUEUE_SIZE)
+
+
+def handle_project_event(event: dict) -> None:
+    """
+    Обработчик шины событий: сбрасывает кэши этого процесса и пересылает событие подписчикам.
+
+    Вызывается в каждом процессе, в том числе в том, где произошло изменение.
+    """
+    if event["entity"] == "bus" and event["action"] == "reset":
+        membership_cache.clear()
+        board_cache.clear()
+        broker.resync_all()
+        return
+
+    project_id = UUID(event["project_id"])
+    invalidate_board(project_id)
+    if event["entity"] == "member" and event.get("id"):
+        invalidate_membership(project_id, UUID(event["id"]))
+    broker.publish(project_id, event)
+
+
+bus.subscribe(handle_project_event)
+
+
+class ProjectEventService:
+    """
+    Публикация изменений проекта в шину событий.
+
+    События доставляются только после коммита транзакции запроса, поэтому
+    ни кэши, ни подписчики SSE и WebSocket не увидят изменений, которые затем откатились.
+    """
+
+    def __init__(self, project_dao: ProjectDAO = Depends()):
+        self.project_dao = project_dao
+
+    async def publish(
+            self,
+            project_id: UUID,
+            entity: str,
+            action: str,
+            entity_id: Optional[UUID] = None,
+            data: Optional[Any] = None
+    ) -> None:
+        """
+        Опубликовать событие проекта и увеличить версию проекта.
+
+        Args:
+            project_id (UUID): Идентификатор проекта.
+            entity (str): Тип сущности: task, column, member, project, board.
+            action (str): Действие: created, updated, moved, deleted, rebalanced.
+            entity_id (UUID, optional): Идентификатор изменённой сущности.
+            data (Any, optional): Новое состояние сущности или изменённые поля.
+        """
+        version = await self.project_dao.bump_version(project_id)
+        event = jsonable_encoder({
+            "project_id": project_id,
+            "version": version,
+            "entity": entity,
+            "action": action,
+            "id": entity_id,
+            "data": data,
+        })
+        await bus.publish(self.project_dao.session, event)
@@ -1,13 +1,21 @@
+from datetime import date, datetime
 from uuid import UUID
 from fastapi import Depends, HTTPException
+from fastapi.encoders import jsonable_encoder
 from typing import List, Optional
-from src.dao.logs import ProjectLogDAO
-from src.schemas.log import ProjectLogCreate, ProjectLogResponse
+from src.dao.logs import ProjectLogDAO, ProjectLogDailyDAO
+from src.db import after_commit
+from src.models import LogEventType
+from src.responses import construct
+from src.schemas.log import ProjectLogCreate, ProjectLogResponse, ProjectLogDailyResponse
+from src.schemas.pagination import Page
+from src.service.log_writer import log_writer
 
 class ProjectLogService:
-    def __init__(self, log_dao: ProjectLogDAO = Depends()):
+    def __init__(self, log_dao: ProjectLogDAO = Depends(), daily_dao: ProjectLogDailyDAO = Depends()):
         super().__init__()
         self.log_dao = log_dao
+        self.daily_dao = daily_dao
 
     async def get(self, log_id: UUID) -> ProjectLogResponse:
         db_log = await self.log_dao.find_by_id(log_id)
@@ -15,36 +23,127 @@ class ProjectLogService:
             raise HTTPException(status_code=404, detail="Log not found")
         return ProjectLogResponse.model_validate(db_log, from_attributes=True)
 
-    async def get_by_task(self, task_id: UUID) -> List[ProjectLogResponse]:
-        logs = await self.log_dao.find_all(task_id=task_id)
-        return [ProjectLogResponse.model_validate(l, from_attributes=True) for l in logs]
+    @staticmethod
+    def _payload_filter(column_id: Optional[UUID] = None, member_id: Optional[UUID] = None) -> dict:
+        payload = {}
+        if column_id:
+            payload["column_id"] = str(column_id)
+        if member_id:
+            payload["member_id"] = str(member_id)
+        return payload
 
-    async def get_by_project(self, project_id: UUID) -> List[ProjectLogResponse]:
-        logs = await self.log_dao.find_all(project_id=project_id)
-        return [ProjectLogResponse.model_validate(l, from_attributes=True) for l in logs]
+    @staticmethod
+    def _column_filter(type: Optional[LogEventType] = None, user_id: Optional[UUID] = None, **filter_by) -> dict:
+        if type:
+            filter_by["type"] = type.value
+        if user_id:
+            filter_by["user_id"] = user_id
+        return filter_by
+
+    async def get_by_task(
+        self,
+        task_id: UUID,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        type: Optional[LogEventType] = None,
+        user_id: Optional[UUID] = None,
+        column_id: Optional[UUID] = None
+    ) -> Page[ProjectLogResponse]:
+        """
+        Страница логов задачи, от новых к старым, с фильтрами по типу события, автору и колонке.
+        """
+        logs, next_cursor = await self.log_dao.find_page_filtered(
+            limit, cursor,
+            payload=self._payload_filter(column_id=column_id),
+            **self._column_filter(type, user_id, task_id=task_id)
+        )
+        return Page(
+            items=[construct(ProjectLogResponse, l) for l in logs],
+            next_cursor=next_cursor
+        )
+
+    async def get_by_project(
+        self,
+        project_id: UUID,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        type: Optional[LogEventType] = None,
+        user_id: Optional[UUID] = None,
+        task_id: Optional[UUID] = None,
+        column_id: Optional[UUID] = None,
+        member_id: Optional[UUID] = None
+    ) -> Page[ProjectLogResponse]:
+        """
+        Страница логов проекта, от новых к старым.
+
+        Фильтры `type`, `user_id` (автор) и `task_id` применяются к колонкам лога,
+        `column_id` и `member_id` — к payload через GIN-индекс.
+        """
+        filter_by = self._column_filter(type, user_id, project_id=project_id)
+        if task_id:
+            filter_by["task_id"] = task_id
+        logs, next_cursor = await self.log_dao.find_page_filtered(
+            limit, cursor,
+            payload=self._payload_filter(column_id=column_id, member_id=member_id),
+            **filter_by
+        )
+        return Page(
+            items=[construct(ProjectLogResponse, l) for l in logs],
+            next_cursor=next_cursor
+        )
+
+    async def get_daily_by_project(
+        self,
+        project_id: UUID,
+        since: Optional[date] = None,
+        until: Optional[date] = None
+    ) -> list[ProjectLogDailyResponse]:
+        """
+        Дневные сводки логов проекта, оставшиеся после удаления подробных логов по сроку хранения.
+        """
+        rows = await self.daily_dao.find_by_project(project_id, since, until)
+        return [construct(ProjectLogDailyResponse, r) for r in rows]
 
     async def add_log(
         self,
-        type: str,
+        type: LogEventType,
         project_id: Optional[UUID] = None,
         task_id: Optional[UUID] = None,
         user_id: Optional[UUID] = None,
+        payload: Optional[dict] = None,
         info: Optional[str] = None
-    ) -> ProjectLogResponse:
+    ) -> None:
         """
         Быстрое добавление записи в логи (для вызова из других сервисов).
+
+        `payload` — структурированные данные события (id колонок, участников, изменённые поля),
+        сохраняются в JSONB; UUID и даты приводятся к строкам.
+
+        Если запущена фоновая запись (`log_writer`), запись ставится в её очередь после
+        коммита транзакции запроса и пишется пачкой отдельно от неё; логи откаченных
+        изменений при этом не пишутся. Иначе запись добавляется сразу в текущей транзакции.
         """
-        log = await self.log_dao.add(
+        now = datetime.utcnow()
+        row = dict(
             project_id=project_id,
             task_id=task_id,
             user_id=user_id,
-            type=type,
-            info=info
+            type=LogEventType(type).value,
+            info=info,
+            payload=jsonable_encoder(payload) if payload is not None else None,
+            created_at=now,
+            updated_at=now
         )
+        if not log_writer.running:
+            await self.log_dao.add(**row)
+        elif self.log_dao.session.info.get("unit_of_work"):
+            after_commit(self.log_dao.session, lambda: log_writer.put(row))
+        else:
+            await log_writer.put(row)
 
     # await log_service.add_log(
     #     task_id=task_id,
     #     user_id=current_user.id,
-    #     type="update",
-    #     info="Изменено поле title"
+    #     type=LogEventType.task_update,
+    #     payload={"changes": {"title": "Новый заголовок"}}
     # )
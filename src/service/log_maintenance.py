@@ -0,0 +1,297 @@
+"""
+Обслуживание секционированной таблицы `project_logs`.
+
+Создаёт месячные секции заранее, сворачивает истёкшие по сроку хранения логи
+в дневные сводки `project_log_daily`, удаляет (или отсоединяет для архива) секции,
+истёкшие для всех проектов, и удаляет оставшиеся истёкшие строки.
+
+Запуск вручную или по cron: `python -m src.service.log_maintenance`.
+"""
+import asyncio
+import datetime
+import logging
+import re
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.db import async_session_maker, engine
+
+logger = logging.getLogger(__name__)
+
+# Ключ advisory-блокировки: обслуживание выполняет только один процесс одновременно
+ADVISORY_LOCK_KEY = 0x6C6F6773
+PARTITION_NAME = re.compile(r"^project_logs_(\d{4})(\d{2})$")
+
+# Срок хранения лога: по настройке его проекта или по умолчанию (в том числе для логов без проекта)
+RETENTION_DAYS = (
+    "coalesce((SELECT p.log_retention_days FROM projects p WHERE p.id = l.project_id), "
+    "CAST(:default_days AS integer))"
+)
+EXPIRED = (
+    f"l.created_at < CAST(:now AS timestamp) - make_interval(days => {RETENTION_DAYS}) "
+    # Константная граница отсекает свежие секции (partition pruning)
+    "AND l.created_at < CAST(:oldest_cutoff AS timestamp)"
+)
+
+
+def add_months(month: datetime.date, count: int) -> datetime.date:
+    """Первое число месяца, отстоящего от `month` на `count` месяцев."""
+    index = month.year * 12 + month.month - 1 + count
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+class LogMaintenance:
+    """Операции обслуживания логов в рамках одной транзакции."""
+
+    def __init__(self, session: AsyncSession):
+        """
+        :param session: Асинхронная сессия SQLAlchemy вне режима unit of work.
+        """
+        self.session = session
+
+    async def run(self, now: Optional[datetime.datetime] = None) -> dict:
+        """
+        Выполнить полный цикл обслуживания в двух транзакциях.
+
+        DROP/DETACH секции берёт ACCESS EXCLUSIVE на `project_logs`, поэтому удаление секций
+        (вместе со сводкой их строк) фиксируется отдельной короткой транзакцией, а долгий
+        DELETE истёкших строк из оставшихся секций выполняется уже без этой блокировки.
+        В каждой транзакции сводка и удаление одних и тех же строк атомарны, поэтому строки
+        не попадут в сводку дважды.
+
+        :param now: Текущее время (UTC), по умолчанию `datetime.utcnow()`.
+        :return: Сводка выполненных действий; `skipped`, если обслуживание уже идёт в другом процессе.
+        """
+        now = now or datetime.datetime.utcnow()
+        if not await self._try_lock():
+            return {"skipped": True}
+        expired_partitions, keep_from = await self.expired_partitions(now)
+        rolled_up = await self.rollup_expired(now, before=keep_from) if expired_partitions else 0
+        removed = await self.remove_partitions(expired_partitions)
+        await self.session.commit()
+
+        if not await self._try_lock():
+            return {"skipped": True, "removed_partitions": removed}
+        created = await self.ensure_partitions(now)
+        rolled_up += await self.rollup_expired(now, since=keep_from)
+        deleted = await self.delete_expired_rows(now, since=keep_from)
+        await self.session.commit()
+        return {
+            "skipped": False,
+            "created_partitions": created,
+            "rolled_up_rows": rolled_up,
+            "removed_partitions": removed,
+            "deleted_rows": deleted,
+        }
+
+    async def _try_lock(self) -> bool:
+        """Взять advisory-блокировку обслуживания до конца текущей транзакции, не дожидаясь её."""
+        return await self.session.scalar(
+            text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": ADVISORY_LOCK_KEY}
+        )
+
+    async def prepare(self, now: Optional[datetime.datetime] = None) -> list[str]:
+        """
+        Только создать недостающие секции и зафиксировать (выполняется при старте приложения).
+
+        В отличие от `run`, ждёт advisory-блокировку: несколько воркеров стартуют одновременно.
+
+        :param now: Текущее время (UTC), по умолчанию `datetime.utcnow()`.
+        :return: Имена созданных секций.
+        """
+        now = now or datetime.datetime.utcnow()
+        await self.session.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": ADVISORY_LOCK_KEY})
+        created = await self.ensure_partitions(now)
+        await self.session.commit()
+        return created
+
+    async def partitions(self) -> dict[str, datetime.date]:
+        """
+        Текущие месячные секции `project_logs`.
+
+        :return: Словарь имя секции -> первое число её месяца.
+        """
+        result = await self.session.execute(text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = 'project_logs'::regclass"
+        ))
+        partitions = {}
+        for (name,) in result:
+            match = PARTITION_NAME.match(name)
+            if match:
+                partitions[name] = datetime.date(int(match[1]), int(match[2]), 1)
+        return partitions
+
+    async def ensure_partitions(self, now: datetime.datetime) -> list[str]:
+        """
+        Создать секции на текущий и `LOG_PARTITIONS_AHEAD` следующих месяцев.
+
+        :return: Имена созданных секций.
+        """
+        existing = await self.partitions()
+        current = now.date().replace(day=1)
+        created = []
+        for offset in range(settings.LOG_PARTITIONS_AHEAD + 1):
+            month = add_months(current, offset)
+            name = f"project_logs_{month:%Y%m}"
+            if name in existing:
+                continue
+            await self.session.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF project_logs "
+                f"FOR VALUES FROM ('{month}') TO ('{add_months(month, 1)}')"
+            ))
+            created.append(name)
+        return created
+
+    async def _retention_bounds(self) -> tuple[int, int]:
+        """Минимальный и максимальный срок хранения среди проектов и значения по умолчанию."""
+        result = await self.session.execute(
+            text(
+                "SELECT min(coalesce(log_retention_days, :default_days)), "
+                "max(coalesce(log_retention_days, :default_days)) FROM projects"
+            ),
+            {"default_days": settings.LOG_RETENTION_DAYS},
+        )
+        shortest, longest = result.one()
+        default = settings.LOG_RETENTION_DAYS
+        if shortest is None:
+            return default, default
+        return min(shortest, default), max(longest, default)
+
+    async def _expiry_params(
+            self,
+            now: datetime.datetime,
+            since: Optional[datetime.date] = None,
+            before: Optional[datetime.date] = None
+    ) -> tuple[str, dict]:
+        """Условие истечения логов (с границами по `created_at`) и его параметры."""
+        shortest, _ = await self._retention_bounds()
+        condition = EXPIRED
+        params = {
+            "now": now,
+            "default_days": settings.LOG_RETENTION_DAYS,
+            "oldest_cutoff": now - datetime.timedelta(days=shortest),
+        }
+        if since is not None:
+            condition += " AND l.created_at >= CAST(:since AS timestamp)"
+            params["since"] = since
+        if before is not None:
+            condition += " AND l.created_at < CAST(:before AS timestamp)"
+            params["before"] = before
+        return condition, params
+
+    async def rollup_expired(
+            self,
+            now: datetime.datetime,
+            since: Optional[datetime.date] = None,
+            before: Optional[datetime.date] = None
+    ) -> int:
+        """
+        Добавить истёкшие логи в дневные сводки по проекту и типу.
+
+        :param since: Учитывать только логи не раньше этой даты.
+        :param before: Учитывать только логи раньше этой даты.
+        :return: Количество свёрнутых строк логов.
+        """
+        condition, params = await self._expiry_params(now, since, before)
+        result = await self.session.execute(
+            text(
+                "WITH rolled AS ("
+                "SELECT l.project_id, l.created_at::date AS day, l.type, count(*) AS count FROM project_logs l "
+                f"WHERE l.project_id IS NOT NULL AND {condition} "
+                "GROUP BY l.project_id, l.created_at::date, l.type"
+                "), inserted AS ("
+                "INSERT INTO project_log_daily AS d (project_id, day, type, count) SELECT * FROM rolled "
+                "ON CONFLICT (project_id, day, type) DO UPDATE SET count = d.count + excluded.count"
+                ") SELECT coalesce(sum(count), 0) FROM rolled"
+            ),
+            params,
+        )
+        return result.scalar_one()
+
+    async def expired_partitions(self, now: datetime.datetime) -> tuple[list[str], datetime.date]:
+        """
+        Секции, истёкшие для всех проектов.
+
+        :return: Имена секций и начало первого месяца, секция которого остаётся;
+            все строки удаляемых секций старше этой даты.
+        """
+        _, longest = await self._retention_bounds()
+        cutoff = (now - datetime.timedelta(days=longest)).date()
+        expired = [
+            name for name, month in sorted((await self.partitions()).items(), key=lambda item: item[1])
+            if add_months(month, 1) <= cutoff
+        ]
+        return expired, cutoff.replace(day=1)
+
+    async def remove_partitions(self, names: list[str]) -> list[str]:
+        """
+        Удалить секции или отсоединить их при `LOG_ARCHIVE_EXPIRED_PARTITIONS`.
+
+        Вызывать в одной транзакции после `rollup_expired` по их строкам, чтобы строки попали в сводки.
+
+        :return: Имена удалённых или отсоединённых секций.
+        """
+        for name in names:
+            if settings.LOG_ARCHIVE_EXPIRED_PARTITIONS:
+                await self.session.execute(text(f"ALTER TABLE project_logs DETACH PARTITION {name}"))
+            else:
+                await self.session.execute(text(f"DROP TABLE {name}"))
+        return names
+
+    async def delete_expired_rows(self, now: datetime.datetime, since: Optional[datetime.date] = None) -> int:
+        """
+        Удалить истёкшие логи проектов с коротким сроком хранения из оставшихся секций.
+
+        :param since: Не трогать логи раньше этой даты (они в удаляемых или отсоединяемых целиком секциях).
+        :return: Количество удалённых строк.
+        """
+        condition, params = await self._expiry_params(now, since=since)
+        result = await self.session.execute(text(f"DELETE FROM project_logs l WHERE {condition}"), params)
+        return result.rowcount
+
+
+async def run_maintenance() -> dict:
+    """Выполнить обслуживание логов в отдельной сессии."""
+    async with async_session_maker() as session:
+        return await LogMaintenance(session).run()
+
+
+async def prepare_partitions() -> None:
+    """Создать секции логов на ближайшие месяцы при старте приложения; ошибка не мешает старту."""
+    try:
+        async with async_session_maker() as session:
+            created = await LogMaintenance(session).prepare()
+        if created:
+            logger.info("Created project log partitions: %s", created)
+    except Exception:
+        logger.exception("Failed to create project log partitions")
+
+
+async def run_periodically(interval: float) -> None:
+    """
+    Выполнять обслуживание каждые `interval` секунд (фоновая задача приложения).
+
+    Ошибки логируются и не останавливают цикл.
+    """
+    while True:
+        try:
+            summary = await run_maintenance()
+            logger.info("Project log maintenance: %s", summary)
+        except Exception:
+            logger.exception("Project log maintenance failed")
+        await asyncio.sleep(interval)
+
+
+async def main() -> None:
+    try:
+        print(await run_maintenance())
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
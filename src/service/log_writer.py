@@ -0,0 +1,144 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from sqlalchemy.exc import IntegrityError
+
+from src.config import settings
+from src.dao.logs import ProjectLogDAO
+from src.db import async_session_maker
+
+logger = logging.getLogger(__name__)
+
+
+class ProjectLogWriter:
+    """
+    Буферизованная запись логов проектов.
+
+    Записи копятся в очереди и пишутся фоновой задачей пачками одним многострочным
+    INSERT в отдельной транзакции — по достижении `batch_size` или через `flush_seconds`
+    после первой записи пачки. Очередь ограничена `max_queue`: при переполнении
+    добавление ждёт не дольше `put_timeout`, после чего запись пишется напрямую.
+    """
+
+    def __init__(self, batch_size: int, flush_seconds: float, max_queue: int, put_timeout: float):
+        """
+        :param batch_size: Максимальный размер пачки.
+        :param flush_seconds: Максимальное время ожидания неполной пачки в секундах.
+        :param max_queue: Максимальное количество записей в очереди.
+        :param put_timeout: Сколько ждать места в переполненной очереди, в секундах.
+        """
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.max_queue = max_queue
+        self.put_timeout = put_timeout
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._written = 0
+        self._dropped = 0
+        self._overflows = 0
+        self._batches = 0
+
+    @property
+    def running(self) -> bool:
+        """Запущена ли фоновая запись; иначе логи пишутся синхронно в транзакции запроса."""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Запустить фоновую задачу записи (вызывается при старте приложения)."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._task = asyncio.create_task(self._run(), name="project-log-writer")
+
+    async def stop(self) -> None:
+        """Дописать всё, что осталось в очереди, и остановить фоновую задачу."""
+        if not self.running:
+            return
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+
+    async def put(self, row: dict) -> None:
+        """
+        Поставить запись в очередь.
+
+        :param row: Поля записи `ProjectLog`; `created_at` должен быть уже заполнен.
+        """
+        try:
+            await asyncio.wait_for(self._queue.put(row), timeout=self.put_timeout)
+        except asyncio.TimeoutError:
+            # Фоновая запись не успевает: пишем сами, замедляя запрос, но не теряя лог
+            self._overflows += 1
+            await self._write([row])
+
+    async def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            row = await self._queue.get()
+            if row is None:
+                break
+            batch = [row]
+            deadline = time.monotonic() + self.flush_seconds
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    row = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if row is None:
+                    stopping = True
+                    break
+                batch.append(row)
+            await self._write(batch)
+
+    async def _write(self, rows: list[dict]) -> None:
+        """Записать пачку одним INSERT; при ошибке целостности — построчно, пропуская битые записи."""
+        try:
+            async with async_session_maker() as session:
+                await ProjectLogDAO(session).add_many(rows)
+            self._written += len(rows)
+            self._batches += 1
+            return
+        except IntegrityError:
+            # Например, задача удалена до того, как её лог успел записаться
+            pass
+        except Exception:
+            logger.exception("Failed to write %d project log records", len(rows))
+            self._dropped += len(rows)
+            return
+
+        for row in rows:
+            try:
+                async with async_session_maker() as session:
+                    await ProjectLogDAO(session).add(**row)
+                self._written += 1
+            except Exception as e:
+                logger.warning("Dropped project log record %s: %s", row, e)
+                self._dropped += 1
+
+    def metrics(self) -> dict:
+        """
+        Текущие метрики записи логов.
+
+        :return: Словарь с глубиной очереди и количеством записанных, потерянных и записанных напрямую логов.
+        """
+        return {
+            "running": self.running,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "written": self._written,
+            "batches": self._batches,
+            "dropped": self._dropped,
+            "overflows": self._overflows,
+        }
+
+
+log_writer = ProjectLogWriter(
+    batch_size=settings.LOG_WRITER_BATCH_SIZE,
+    flush_seconds=settings.LOG_WRITER_FLUSH_SECONDS,
+    max_queue=settings.LOG_WRITER_MAX_QUEUE,
+    put_timeout=settings.LOG_WRITER_PUT_TIMEOUT_SECONDS,
+)
@@ -0,0 +1,90 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from fastapi import HTTPException, status
+
+from src.config import settings
+
+
+class PasswordHashPool:
+    """
+    Ограниченный пул потоков для хеширования и проверки паролей.
+
+    bcrypt отпускает GIL, поэтому потоков достаточно, чтобы не блокировать event loop.
+    Если в очереди уже `max_queue` задач сверх занятых потоков, запрос сразу
+    отклоняется с 503 вместо бесконечного ожидания.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        """
+        :param workers: Количество потоков пула.
+        :param max_queue: Максимальное количество задач, ожидающих свободный поток.
+        """
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._pending = 0
+        self._rejected = 0
+        self._completed = 0
+        self._total_seconds = 0.0
+        self._max_seconds = 0.0
+
+    async def run(self, func: Callable[..., Any], *args) -> Any:
+        """
+        Выполнить `func(*args)` в пуле.
+
+        :raises HTTPException: 503, если пул перегружен.
+        """
+        if self._pending >= self.workers + self.max_queue:
+            self._rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication is temporarily overloaded, try again later",
+                headers={"Retry-After": "1"},
+            )
+
+        loop = asyncio.get_running_loop()
+        future = self._executor.submit(self._timed, func, args)
+        self._pending += 1
+        # Слот освобождается, когда хеширование действительно закончилось: отмена ожидающего
+        # запроса не останавливает уже запущенный поток
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(self._release))
+        result, elapsed = await asyncio.wrap_future(future)
+
+        self._completed += 1
+        self._total_seconds += elapsed
+        self._max_seconds = max(self._max_seconds, elapsed)
+        return result
+
+    def _release(self) -> None:
+        self._pending -= 1
+
+    @staticmethod
+    def _timed(func: Callable[..., Any], args: tuple) -> tuple[Any, float]:
+        started = time.perf_counter()
+        result = func(*args)
+        return result, time.perf_counter() - started
+
+    def metrics(self) -> dict:
+        """
+        Текущие метрики пула.
+
+        :return: Словарь с размером очереди, количеством отказов и латентностью хеширования.
+        """
+        return {
+            "workers": self.workers,
+            "in_flight": min(self._pending, self.workers),
+            "queue_depth": max(self._pending - self.workers, 0),
+            "rejected": self._rejected,
+            "completed": self._completed,
+            "avg_hash_seconds": self._total_seconds / self._completed if self._completed else 0.0,
+            "max_hash_seconds": self._max_seconds,
+        }
+
+
+password_pool = PasswordHashPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
@@ -1,18 +1,25 @@
+import asyncio
+from typing import Optional
 from uuid import UUID
 
 from fastapi import Depends, HTTPException, status
 from pydantic import EmailStr
 
+from src.cache import invalidate_membership
 from src.dao import ColumnDAO
 from src.dao.project import ProjectDAO, ProjectUserDAO
+from src.db import run_concurrently
 from src.dao.user import UserDAO
 
-from src.models import User
+from src.models import User, LogEventType
+from src.rank import spread_ranks
 from src.models.enums import InviteProjectUserRole
 from src.models.project import ProjectUserRole, Project
 
 from src.schemas.project import ProjectCreate, ProjectResponse, ProjectMemberResponse, \
     ProjectResponseShort
+from src.schemas.pagination import Page
+from src.service.events import ProjectEventService
 from src.service.log import ProjectLogService
 
 
@@ -28,13 +35,23 @@ class ProjectService:
              project_user_dao: ProjectUserDAO = Depends(),
              column_dao: ColumnDAO = Depends(),
              user_dao: UserDAO = Depends(),
-             log_service: ProjectLogService = Depends()
+             log_service: ProjectLogService = Depends(),
+             events: ProjectEventService = Depends()
              ):
         self.project_dao = project_dao
         self.project_user_dao = project_user_dao
         self.column_dao = column_dao
         self.user_dao = user_dao
         self.log_service = log_service
+        self.events = events
+
+    def _invalidate_membership(self, project_id: UUID, user_id: UUID) -> None:
+        """
+        Сбрасывает закэшированную роль участника сразу. После коммита роль ещё раз
+        сбрасывается во всех процессах по событию `member` из шины событий, чтобы параллельный
+        запрос не закэшировал роль из ещё не зафиксированной транзакции.
+        """
+        invalidate_membership(project_id, user_id)
 
     async def create_project(self, project: ProjectCreate, owner: User) -> ProjectResponse:
         """
@@ -61,8 +78,8 @@ class ProjectService:
         await self.log_service.add_log(
             project_id=db_project.id,
             user_id=owner.id,
-            type="create",
-            info=f"project"
+            type=LogEventType.project_create,
+            payload={"name": db_project.name}
         )
 
         return ProjectResponse(
@@ -93,7 +110,7 @@ class ProjectService:
         - "Review"
         - "Done"
 
-        Каждая колонка создается с позицией, соответствующей порядковому номеру в списке.
+        Колонки получают равномерно распределённые ранги в порядке списка.
 
         Args:
             project (Project): Экземпляр проекта, для которого создаются колонки.
@@ -102,12 +119,10 @@ class ProjectService:
             None
         """
         default_columns = ["Backlog", "Doing", "Review", "Done"]
-        for idx, column_name in enumerate(default_columns):
-            await self.column_dao.add(
-                project_id=project.id,
-                name=column_name,
-                position=idx
-            )
+        await self.column_dao.add_many([
+            {"project_id": project.id, "name": column_name, "rank": rank}
+            for column_name, rank in zip(default_columns, spread_ranks(len(default_columns)))
+        ])
 
     async def invite_member(self, project_id: UUID, email: EmailStr, current_user_id: UUID) -> ProjectMemberResponse:
         """
@@ -143,15 +158,16 @@ class ProjectService:
             project_id=project_id,
             user_id=user.id,
         )
+        self._invalidate_membership(project_id, user.id)
 
         await self.log_service.add_log(
             project_id=project.id,
             user_id=current_user_id,
-            type="member invite",
-            info=f"{user.id}"
+            type=LogEventType.member_invite,
+            payload={"member_id": user.id, "role": project_user.role.name}
         )
 
-        return ProjectMemberResponse(
+        response = ProjectMemberResponse(
             id=user.id,
             username=user.username,
             name=user.name,
@@ -159,20 +175,34 @@ class ProjectService:
             role=project_user.role,
             created_at=user.created_at,
         )
+        await self.events.publish(project_id, "member", "created", user.id, response)
+        return response
 
-    async def get_my_projects(self, user_id: UUID) -> list[ProjectResponseShort]:
+    async def get_my_projects(
+            self,
+            user_id: UUID,
+            limit: int = 50,
+            cursor: Optional[str] = None
+    ) -> Page[ProjectResponseShort]:
         """
-        Возвращает список всех проектов, в которых участвует пользователь.
+        Возвращает страницу проектов, в которых участвует пользователь.
 
         Args:
             user_id (UUID): Идентификатор пользователя.
+            limit (int): Размер страницы.
+            cursor (Optional[str]): Курсор, полученный с предыдущей страницы.
 
         Returns:
-            list[ProjectResponseShort]: Список проектов с краткой информацией.
+            Page[ProjectResponseShort]: Проекты с краткой информацией и курсор следующей страницы.
         """
 
-        projects = await self.project_dao.get_projects_by_user(user_id=user_id)
-        return [ProjectResponseShort.model_validate(p) for p in projects]
+        projects, next_cursor = await self.project_dao.get_projects_by_user(
+            user_id=user_id, limit=limit, cursor=cursor
+        )
+        return Page(
+            items=[ProjectResponseShort.model_validate(p) for p in projects],
+            next_cursor=next_cursor
+        )
 
     async def get_project(self, project_id: UUID) -> ProjectResponse:
         """
@@ -188,11 +218,14 @@ class ProjectService:
             HTTPException: 404, если проект не найден.
         """
 
-        project = await self.project_dao.find_by_id(project_id)
+        # Проект читается на соединении запроса, участники параллельно — на одном дополнительном
+        project, (members,) = await asyncio.gather(
+            self.project_dao.find_by_id(project_id),
+            run_concurrently(lambda session: ProjectUserDAO(session).get_project_members(project_id=project_id)),
+        )
         if not project:
             raise HTTPException(status_code=404, detail="Project not found")
 
-        members = await self.project_user_dao.get_project_members(project_id=project_id)
         return ProjectResponse(
             id=project.id,
             name=project.name,
@@ -231,16 +264,17 @@ class ProjectService:
                 detail="Project owner cannot change their own role"
             )
         await self.project_user_dao.update_role(project_id, user_id, new_role.name)
+        self._invalidate_membership(project_id, user_id)
         user = await self.user_dao.find_by_id(user_id)
 
         await self.log_service.add_log(
             project_id=project_id,
             user_id=current_user_id,
-            type="member change role",
-            info=f"{user.id} to {new_role.name}"
+            type=LogEventType.member_change_role,
+            payload={"member_id": user.id, "role": new_role.name}
         )
 
-        return ProjectMemberResponse(
+        response = ProjectMemberResponse(
             id=user.id,
             username=user.username,
             name=user.name,
@@ -248,6 +282,8 @@ class ProjectService:
             created_at=user.created_at,
             role=new_role.name,
         )
+        await self.events.publish(project_id, "member", "updated", user.id, response)
+        return response
 
     async def remove_member(
             self,
@@ -290,26 +326,30 @@ class ProjectService:
 
         if current_project_user.role == ProjectUserRole.owner:
             await self.project_user_dao.remove_project_member(project_id, user_id)
+            self._invalidate_membership(project_id, user_id)
 
             await self.log_service.add_log(
                 project_id=project_id,
                 user_id=current_user_id,
-                type="member remove",
-                info=f"{user_id}"
+                type=LogEventType.member_remove,
+                payload={"member_id": user_id}
             )
+            await self.events.publish(project_id, "member", "deleted", user_id)
 
             return True
 
         if current_project_user.role == ProjectUserRole.admin:
             if project_user.role in [ProjectUserRole.member]:
                 await self.project_user_dao.remove_project_member(project_id, user_id)
+                self._invalidate_membership(project_id, user_id)
 
                 await self.log_service.add_log(
                     project_id=project_id,
                     user_id=current_user_id,
-                    type="member remove",
-                    info=f"{user_id}"
+                    type=LogEventType.member_remove,
+                    payload={"member_id": user_id}
                 )
+                await self.events.publish(project_id, "member", "deleted", user_id)
                 return True
 
             else:
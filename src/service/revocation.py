@@ -0,0 +1,99 @@
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from src.cache import invalidate_user
+from src.config import settings
+from src.dao.token import TokenRevocationDAO
+from src.models import User
+
+
+class TokenRevocationList:
+    """
+    In-memory список отозванных токенов.
+
+    Источник истины — таблица `token_revocations`; список перечитывается из неё
+    не чаще раза в `refresh_seconds`, поэтому проверка токена не требует запросов к БД.
+    Отзывы, сделанные в текущем процессе, применяются сразу.
+    """
+
+    def __init__(self, refresh_seconds: float):
+        """
+        :param refresh_seconds: Интервал перечитывания таблицы отзывов в секундах.
+        """
+        self.refresh_seconds = refresh_seconds
+        self._jtis: set[str] = set()
+        self._users: dict[str, float] = {}
+        self._loaded_at: float = float("-inf")
+
+    async def refresh_if_stale(self, revocation_dao: TokenRevocationDAO) -> None:
+        """
+        Перечитать таблицу отзывов, если список устарел.
+
+        :param revocation_dao: DAO для таблицы отзывов.
+        """
+        now = time.monotonic()
+        if now - self._loaded_at < self.refresh_seconds:
+            return
+
+        # Сдвигаем отметку заранее, чтобы параллельные запросы не перечитывали таблицу одновременно
+        previous, self._loaded_at = self._loaded_at, now
+        try:
+            rows = await revocation_dao.find_active()
+        except Exception:
+            self._loaded_at = previous
+            raise
+
+        jtis, users = set(), {}
+        for jti, username, revoked_at in rows:
+            if jti:
+                jtis.add(jti)
+            if username:
+                revoked_ts = revoked_at.replace(tzinfo=timezone.utc).timestamp()
+                users[username] = max(users.get(username, 0.0), revoked_ts)
+        self._jtis, self._users = jtis, users
+
+    def is_revoked(self, payload: dict) -> bool:
+        """
+        Проверить, отозван ли токен.
+
+        :param payload: Payload декодированного токена.
+        :return: True, если токен отозван лично или выпущен до отзыва всех токенов пользователя.
+        """
+        if payload.get("jti") in self._jtis:
+            return True
+        revoked_before = self._users.get(payload.get("sub"))
+        return revoked_before is not None and payload.get("iat", 0) <= revoked_before
+
+    async def revoke_token(self, revocation_dao: TokenRevocationDAO, payload: dict) -> None:
+        """
+        Отозвать конкретный токен (например, при выходе из системы).
+
+        :param revocation_dao: DAO для таблицы отзывов.
+        :param payload: Payload отзываемого токена, должен содержать `jti` и `exp`.
+        """
+        jti = payload.get("jti")
+        if not jti:
+            return
+        await revocation_dao.add(
+            jti=jti,
+            expires_at=datetime.utcfromtimestamp(payload["exp"]),
+        )
+        self._jtis.add(jti)
+
+    async def revoke_user(self, revocation_dao: TokenRevocationDAO, user: User) -> None:
+        """
+        Отозвать все ранее выпущенные токены пользователя (например, при смене пароля).
+
+        :param revocation_dao: DAO для таблицы отзывов.
+        :param user: Пользователь, чьи токены отзываются.
+        """
+        revocation = await revocation_dao.add(
+            user_id=user.id,
+            expires_at=datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+        )
+        self._users[user.username] = revocation.created_at.replace(tzinfo=timezone.utc).timestamp()
+        invalidate_user(user.username)
+
+
+revocation_list = TokenRevocationList(refresh_seconds=settings.TOKEN_REVOCATION_REFRESH_SECONDS)
@@ -1,19 +1,42 @@
-from typing import Union
+from typing import Optional, Union
 from uuid import UUID
 from datetime import date
 
-from fastapi import Depends, HTTPException
+from fastapi import BackgroundTasks, Depends, HTTPException
 
+from src.cache import board_cache
+from src.config import settings
 from src.dao import ColumnDAO, TaskDAO
+from src.dao.task import TaskAccess
 from src.dao.project import ProjectDAO
 from src.dao.user import UserDAO
+from src.db import unit_of_work
 
-from src.models import User
+from src.models import User, LogEventType
+from src.responses import construct
 
 from src.schemas.project import ProjectCreate, ProjectResponse
-from src.schemas.task import TaskCreate, TaskResponse, ProjectTaskResponse, TaskUpdate, TaskColumnUpdate
-from src.schemas.task import ColumnResponse
+from src.schemas.task import TaskCreate, TaskResponse, ProjectTaskResponse, TaskUpdate, TaskColumnUpdate, TaskMove
+from src.schemas.task import ColumnResponse, TaskExpandedResponse, TaskSearchResponse
+from src.service.events import ProjectEventService
 from src.service.log import ProjectLogService
+from src.service.user_loader import UserLoader
+
+
+async def rebalance_column_tasks(column_id: UUID) -> None:
+    """
+    Перераспределяет ранги задач колонки, когда они стали слишком длинными.
+
+    Выполняется фоновой задачей после ответа, поэтому работает в собственной сессии.
+    Ранги всех задач колонки меняются, поэтому версия проекта увеличивается
+    и подписчики получают событие `board`/`rebalanced`.
+    """
+    async with unit_of_work() as session:
+        column = await ColumnDAO(session).find_one_or_none(id=column_id)
+        if not column:
+            return
+        if await TaskDAO(session).rebalance(column_id=column_id):
+            await ProjectEventService(ProjectDAO(session)).publish(column.project_id, "board", "rebalanced")
 
 
 class TaskService:
@@ -28,9 +51,15 @@ class TaskService:
             column_dao: ColumnDAO = Depends(),
             task_dao: TaskDAO = Depends(),
             user_dao: UserDAO = Depends(),
-            log_service: ProjectLogService = Depends()
+            log_service: ProjectLogService = Depends(),
+            events: ProjectEventService = Depends(),
+            user_loader: UserLoader = Depends(),
+            background_tasks: BackgroundTasks = None
     ):
         self.log_service = log_service
+        self.events = events
+        self.user_loader = user_loader
+        self.background_tasks = background_tasks
         self.project_dao = project_dao
         self.column_dao = column_dao
         self.task_dao = task_dao
@@ -48,17 +77,27 @@ class TaskService:
             ProjectResponse: Детальная информация о задаче.
         """
 
-        task = await self.task_dao.add(**task.model_dump(), producer_id=user.id)
         column = await self.column_dao.find_by_id(task.column_id)
+        if not column:
+            raise HTTPException(status_code=404, detail="Column not found")
+
+        rank = await self.task_dao.rank_at(column_id=column.id)
+        task = await self.task_dao.add(
+            **task.model_dump(), producer_id=user.id, project_id=column.project_id, rank=rank
+        )
+        self._check_rank(column.id, rank)
 
         await self.log_service.add_log(
-            project_id=column.project_id,
+            project_id=task.project_id,
             task_id=task.id,
             user_id=user.id,
-            type="task create",
+            type=LogEventType.task_create,
+            payload={"column_id": task.column_id, "title": task.title}
         )
 
-        return TaskResponse.model_validate(task, from_attributes=True)
+        response = TaskResponse.model_validate(task, from_attributes=True)
+        await self.events.publish(task.project_id, "task", "created", task.id, response)
+        return response
 
     async def get_by_project(
         self,
@@ -67,84 +106,306 @@ class TaskService:
         producer_id: UUID = None,
         column_id: UUID = None,
         deadline: date = None,
-        title: str = None
+        title: str = None,
+        q: Optional[str] = None,
+        version: Optional[int] = None
     ) -> ProjectTaskResponse:
         """
         Возвращает список всех задач в проекте, сгруппированных по колонкам с фильтрами.
+
+        Колонки и задачи загружаются одним запросом (см. `TaskDAO.get_board`).
+        При заданном `q` остаются только найденные задачи, отсортированные по релевантности.
+
+        Если известна версия проекта, нефильтрованная доска кэшируется по (project_id, version),
+        а запросы с фильтрами при тёплом кэше отвечаются фильтрацией снимка в памяти.
+        Поиск `q` всегда идёт в БД. Фильтр `title` — поиск подстроки без учёта регистра
+        (символы `%` и `_` не являются шаблонами) в обоих путях.
         """
-        project = await self.project_dao.find_by_id(project_id)
-        if not project:
+        filters = dict(assignee_id=assignee_id, producer_id=producer_id, column_id=column_id,
+                       deadline=deadline, title=title)
+        cacheable = version is not None and q is None
+        if cacheable:
+            board = board_cache.get((project_id, version))
+            if board is not None:
+                return self._filter_board(board, **filters)
+            if not any(filters.values()):
+                # Версия прочитана до запроса доски, поэтому снимок не старше своей версии
+                board = await self._load_board(project_id, project_exists=True)
+                board_cache.set((project_id, version), board)
+                return board
+
+        return await self._load_board(project_id, project_exists=version is not None, q=q, **filters)
+
+    async def _load_board(self, project_id: UUID, project_exists: bool = False, **filters) -> ProjectTaskResponse:
+        """
+        Загружает доску из БД (см. `TaskDAO.get_board`).
+
+        `project_exists` — проект уже найден (например, при чтении версии для ETag),
+        и пустую доску не нужно перепроверять отдельным запросом.
+        """
+        rows = await self.task_dao.get_board(project_id=project_id, **filters)
+        # Пустой результат — либо проекта нет, либо в нём нет колонок
+        if not rows and not project_exists and not await self.project_dao.find_by_id(project_id):
             raise HTTPException(status_code=404, detail="Project not found")
 
-        filtered_tasks = await self.task_dao.find_filtered(
-            project_id=project_id,
-            assignee_id=assignee_id,
-            producer_id=producer_id,
-            column_id=column_id,
-            deadline=deadline,
-            title=title
+        columns: dict[UUID, ColumnResponse] = {}
+        for row in rows:
+            column_response = columns.get(row.board_column_id)
+            if column_response is None:
+                column_response = columns[row.board_column_id] = ColumnResponse(
+                    id=row.board_column_id,
+                    name=row.board_column_name,
+                    position=len(columns),
+                    tasks=[]
+                )
+            if row.id is not None:
+                column_response.tasks.append(construct(TaskResponse, row))
+
+        return ProjectTaskResponse(project_id=project_id, columns=list(columns.values()))
+
+    async def expand_users(self, board: ProjectTaskResponse, fields: frozenset[str]) -> ProjectTaskResponse:
+        """
+        Добавляет к задачам доски профили исполнителя и/или постановщика.
+
+        Профили всех пользователей доски загружаются одним запросом (см. `UserLoader`).
+        Исходная доска (она может быть в кэше) не изменяется.
+
+        Args:
+            board (ProjectTaskResponse): Доска.
+            fields (frozenset[str]): Поля для раскрытия: `assignee`, `producer`.
+
+        Returns:
+            ProjectTaskResponse: Доска с задачами `TaskExpandedResponse`.
+        """
+        if not fields:
+            return board
+        tasks = [task for column in board.columns for task in column.tasks]
+        users = await self.user_loader.load_many(
+            user_id for task in tasks for user_id in (
+                task.assignee_id if "assignee" in fields else None,
+                task.producer_id if "producer" in fields else None,
+            )
         )
 
-        columns = await self.project_dao.get_project_columns_with_tasks(project_id)
-        column_map = {col.id: col for col in columns}
-        for col in columns:
-            col.tasks = []
-        for task in filtered_tasks:
-            if task.column_id in column_map:
-                column_map[task.column_id].tasks.append(task)
+        def expand(task: TaskResponse) -> TaskExpandedResponse:
+            values = {}
+            if "assignee" in fields:
+                values["assignee"] = users.get(task.assignee_id)
+            if "producer" in fields:
+                values["producer"] = users.get(task.producer_id)
+            # Незапрошенные поля остаются неустановленными и не попадают в ответ (exclude_unset)
+            return TaskExpandedResponse.model_construct(
+                **{name: getattr(task, name) for name in TaskResponse.model_fields}, **values
+            )
+
         return ProjectTaskResponse(
-            project_id=project_id,
+            project_id=board.project_id,
             columns=[
                 ColumnResponse(
                     id=column.id,
                     name=column.name,
                     position=column.position,
-                    tasks=[TaskResponse.model_validate(task, from_attributes=True) for task in column_map[column.id].tasks]
-                ) for column in columns
+                    tasks=[expand(task) for task in column.tasks]
+                )
+                for column in board.columns
             ]
         )
 
-    async def update(self, task_id: UUID, task_update: Union[TaskUpdate, TaskColumnUpdate], user_id: UUID) -> TaskResponse:
+    @staticmethod
+    def _filter_board(
+            board: ProjectTaskResponse,
+            assignee_id: Optional[UUID] = None,
+            producer_id: Optional[UUID] = None,
+            column_id: Optional[UUID] = None,
+            deadline: Optional[date] = None,
+            title: Optional[str] = None
+    ) -> ProjectTaskResponse:
+        """
+        Фильтрует закэшированную доску в памяти так же, как `TaskDAO.get_board`:
+        колонки остаются все, из них убираются неподходящие задачи. Снимок не изменяется.
+        """
+        if not any((assignee_id, producer_id, column_id, deadline, title)):
+            return board
+        title = title.lower() if title else None
+
+        def matches(column: ColumnResponse, task: TaskResponse) -> bool:
+            return (
+                (not assignee_id or task.assignee_id == assignee_id)
+                and (not producer_id or task.producer_id == producer_id)
+                and (not column_id or column.id == column_id)
+                and (not deadline or task.deadline == deadline)
+                and (not title or title in task.title.lower())
+            )
+
+        return ProjectTaskResponse(
+            project_id=board.project_id,
+            columns=[
+                ColumnResponse(
+                    id=column.id,
+                    name=column.name,
+                    position=column.position,
+                    tasks=[task for task in column.tasks if matches(column, task)]
+                )
+                for column in board.columns
+            ]
+        )
+
+    async def search(self, user_id: UUID, q: str, limit: int = 20) -> list[TaskSearchResponse]:
+        """
+        Полнотекстовый поиск задач по всем проектам пользователя.
+
+        Args:
+            user_id (UUID): Идентификатор пользователя.
+            q (str): Поисковый запрос.
+            limit (int): Максимальное количество результатов.
+
+        Returns:
+            list[TaskSearchResponse]: Найденные задачи по убыванию релевантности.
+        """
+        rows = await self.task_dao.search(user_id=user_id, q=q, limit=limit)
+        return [
+            construct(TaskSearchResponse, task, project_id=project_id, score=score)
+            for task, project_id, score in rows
+        ]
+
+    async def update(
+            self,
+            task_id: UUID,
+            task_update: Union[TaskUpdate, TaskColumnUpdate],
+            user_id: UUID,
+            access: Optional[TaskAccess] = None
+    ) -> TaskResponse:
         """
         Обновляет существующую задачу.
 
         Args:
             task_id (UUID): Идентификатор задачи для обновления
             task_update (TaskUpdate | TaskColumnUpdate): Данные для обновления задачи. Все поля опциональны.
+            user_id (UUID): Идентификатор пользователя, выполняющего обновление
+            access (TaskAccess, optional): Задача и её проект, уже полученные при проверке прав.
+                Если передан, задача и колонка повторно не запрашиваются.
 
         Returns:
             TaskResponse: Обновленная задача.
 
         Raises:
-            HTTPException: 404, если задача не найдена
+            HTTPException: 404, если задача не найдена или новая колонка не принадлежит проекту задачи
         """
-        task = await self.task_dao.find_by_id(task_id)
+        task = access.task if access else await self.task_dao.find_by_id(task_id)
         if not task:
             raise HTTPException(status_code=404, detail="Task not found")
-
-        if task_update.column_id and not await self.column_dao.find_by_id(task_update.column_id):
-            raise HTTPException(status_code=404, detail="Column not found")
+        # Строка проекта блокируется раньше строки задачи (см. ProjectDAO.lock)
+        await self.project_dao.lock(task.project_id)
 
         update_data = task_update.model_dump(exclude_unset=True)
-        updated_task = await self.task_dao.update(task_id, **update_data)
+        if task_update.column_id and task_update.column_id != task.column_id:
+            column = await self.column_dao.find_by_id(task_update.column_id)
+            # Права проверены только для проекта задачи: переносить задачу в другой проект нельзя
+            if not column or column.project_id != task.project_id:
+                raise HTTPException(status_code=404, detail="Column not found")
+            # В новой колонке задача встаёт в конец
+            rank = await self.task_dao.rank_at(exclude_id=task_id, column_id=column.id)
+            updated_task = await self.task_dao.update(task_id, **update_data, rank=rank)
+            self._check_rank(column.id, rank)
+        else:
+            updated_task = await self.task_dao.update(task_id, **update_data)
+
+        await self.log_service.add_log(
+            project_id=updated_task.project_id,
+            task_id=task.id,
+            user_id=user_id,
+            type=LogEventType.task_update,
+            payload={"changes": update_data}
+        )
+
+        response = TaskResponse.model_validate(updated_task, from_attributes=True)
+        await self.events.publish(updated_task.project_id, "task", "updated", task.id, response)
+        return response
 
-        column = await self.column_dao.find_by_id(updated_task.column_id)
+    async def move(
+            self,
+            task_id: UUID,
+            task_move: TaskMove,
+            user_id: UUID,
+            access: Optional[TaskAccess] = None
+    ) -> TaskResponse:
+        """
+        Перемещает задачу между соседями (в той же или другой колонке проекта).
+
+        Изменяется только ранг перемещаемой задачи, остальные задачи колонки не трогаются.
+
+        Args:
+            task_id (UUID): Идентификатор задачи.
+            task_move (TaskMove): Колонка назначения и соседние задачи.
+            user_id (UUID): Идентификатор пользователя, выполняющего перемещение.
+            access (TaskAccess, optional): Задача и её проект, уже полученные при проверке прав.
+
+        Returns:
+            TaskResponse: Перемещённая задача.
+
+        Raises:
+            HTTPException:
+                404 — если задача или колонка не найдены.
+                400 — если соседи не найдены в колонке назначения или переданы в неверном порядке.
+                409 — если ранги соседей совпали из-за параллельных перемещений.
+        """
+        task = access.task if access else await self.task_dao.find_by_id(task_id)
+        if not task:
+            raise HTTPException(status_code=404, detail="Task not found")
+        if task.id in (task_move.after_id, task_move.before_id):
+            raise HTTPException(status_code=400, detail="Task cannot be its own neighbour")
+
+        column_id = task_move.column_id or task.column_id
+        update_data = {}
+        if column_id != task.column_id:
+            column = await self.column_dao.find_by_id(column_id)
+            if not column or column.project_id != task.project_id:
+                raise HTTPException(status_code=404, detail="Column not found")
+            update_data["column_id"] = column_id
+
+        try:
+            rank = await self.task_dao.rank_next_to(task.id, column_id, task_move.after_id, task_move.before_id)
+        except ValueError:
+            self._schedule_rebalance(column_id)
+            raise HTTPException(status_code=409, detail="Task order changed concurrently, retry the move")
+        if rank is None:
+            raise HTTPException(status_code=400, detail="Neighbour tasks not found in the target column")
+
+        # update обновляет тот же объект из identity map, поэтому исходную колонку запоминаем заранее
+        from_column_id = task.column_id
+        updated_task = await self.task_dao.update(task.id, **update_data, rank=rank)
+        self._check_rank(column_id, rank)
 
         await self.log_service.add_log(
-            project_id=column.project_id,
+            project_id=updated_task.project_id,
             task_id=task.id,
             user_id=user_id,
-            type="task update",
-            info=f"{str(update_data)}"
+            type=LogEventType.task_move,
+            payload={"from_column_id": from_column_id, **task_move.model_dump(exclude_unset=True)}
         )
-        
-        return TaskResponse.model_validate(updated_task, from_attributes=True)
 
-    async def delete(self, task_id: UUID, user_id: UUID) -> None:
+        response = TaskResponse.model_validate(updated_task, from_attributes=True)
+        await self.events.publish(updated_task.project_id, "task", "moved", task.id, {
+            "from_column_id": from_column_id, **task_move.model_dump(exclude_unset=True), "task": response
+        })
+        return response
+
+    def _check_rank(self, column_id: UUID, rank: str) -> None:
+        """Планирует ребалансировку колонки, если новый ранг стал слишком длинным."""
+        if len(rank) > settings.RANK_REBALANCE_LENGTH:
+            self._schedule_rebalance(column_id)
+
+    def _schedule_rebalance(self, column_id: UUID) -> None:
+        if self.background_tasks is not None:
+            self.background_tasks.add_task(rebalance_column_tasks, column_id)
+
+    async def delete(self, task_id: UUID, user_id: UUID, access: Optional[TaskAccess] = None) -> None:
         """
         Удаляет задачу по id.
         """
-        task = await self.task_dao.find_by_id(task_id)
+        task = access.task if access else await self.task_dao.find_by_id(task_id)
         if not task:
             raise HTTPException(status_code=404, detail="Task not found")
+        await self.project_dao.lock(task.project_id)
         await self.task_dao.delete(task_id)
+        await self.events.publish(task.project_id, "task", "deleted", task_id)
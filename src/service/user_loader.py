@@ -0,0 +1,40 @@
+from typing import Iterable, Optional
+from uuid import UUID
+
+from fastapi import Depends
+
+from src.dao.user import UserDAO
+from src.responses import construct
+from src.schemas.user import UserSchema
+
+
+class UserLoader:
+    """
+    Пакетная загрузка профилей пользователей в пределах одного запроса (в духе DataLoader).
+
+    Сервис собирает id пользователей по всему ответу и загружает их одним запросом;
+    уже загруженные профили запоминаются до конца запроса. FastAPI создаёт зависимость
+    один раз на запрос, поэтому все сервисы запроса используют один загрузчик.
+    """
+
+    def __init__(self, user_dao: UserDAO = Depends()):
+        self.user_dao = user_dao
+        self._users: dict[UUID, Optional[UserSchema]] = {}
+
+    async def load_many(self, user_ids: Iterable[Optional[UUID]]) -> dict[UUID, Optional[UserSchema]]:
+        """
+        Загрузить профили пользователей.
+
+        Args:
+            user_ids (Iterable[Optional[UUID]]): Идентификаторы; None и повторы пропускаются.
+
+        Returns:
+            dict[UUID, Optional[UserSchema]]: Профиль по каждому запрошенному id (None, если пользователь не найден).
+        """
+        user_ids = {user_id for user_id in user_ids if user_id is not None}
+        missing = user_ids - self._users.keys()
+        if missing:
+            rows = await self.user_dao.find_by_ids(missing)
+            self._users.update(dict.fromkeys(missing))
+            self._users.update((row.id, construct(UserSchema, row)) for row in rows)
+        return {user_id: self._users[user_id] for user_id in user_ids}